@@ -1,6 +1,7 @@
 """ASGI config for EaszyGoo backend.
 
-This keeps HTTP served by Django ASGI app, and adds WebSocket routing via Channels.
+This keeps HTTP served by Django ASGI app, and adds WebSocket routing via Channels
+unless the process runs with SERVER_ROLE=http (see config/server.py).
 """
 
 import os
@@ -8,6 +9,9 @@ import os
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 
+from config.middleware.concurrency import ConcurrencyLimitMiddleware
+from config.server import server_settings
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 django_asgi_app = get_asgi_application()
@@ -16,9 +20,10 @@ django_asgi_app = get_asgi_application()
 from ws_realtime.middleware.jwt_auth import JwtAuthMiddlewareStack  # noqa: E402
 from ws_realtime.routing import websocket_urlpatterns  # noqa: E402
 
-application = ProtocolTypeRouter(
-	{
-		"http": django_asgi_app,
-		"websocket": JwtAuthMiddlewareStack(URLRouter(websocket_urlpatterns)),
-	}
-)
+_server = server_settings()
+
+protocols = {"http": ConcurrencyLimitMiddleware(django_asgi_app, limit=_server.http_concurrency)}
+if _server.serves_websockets:
+	protocols["websocket"] = JwtAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+
+application = ProtocolTypeRouter(protocols)
@@ -0,0 +1,141 @@
+"""Async fast paths in front of DRF views for hot, read-only endpoints under ASGI.
+
+DRF views are synchronous, so under ASGI every request to them is handed to a worker
+thread for its whole duration. A fast path serves the common case (GET, JSON, valid
+bearer token, right role) on the event loop and only awaits the ORM/cache for I/O.
+Anything else (browsable API, `?format=`, missing or invalid token, wrong role, cold
+cache) raises `Fallback` and is answered by the original DRF view, so error responses
+and edge cases stay byte-for-byte what they were.
+
+Fast paths are opt-in (ASYNC_VIEWS_ENABLED) and only make sense under ASGI; under WSGI an
+async view spins up an event loop per request. Measure with `manage.py benchmark_async_views`:
+Django's own middleware still runs its hooks through sync_to_async, so every ASGI request
+holds a thread either way and the win is limited to the view body.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import URLPattern
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+from config.jsonlib import FastJSONRenderer
+
+
+FastHandler = Callable[..., Awaitable[HttpResponse]]
+
+# Same headers DRF puts on these GET-only ViewSet actions.
+ALLOW_HEADER = "GET, HEAD, OPTIONS"
+
+
+class Fallback(Exception):
+    """Raised by a fast path to let the DRF view answer the request."""
+
+
+def async_views_enabled() -> bool:
+    return bool(getattr(settings, "ASYNC_VIEWS_ENABLED", False))
+
+
+def json_response(data, *, http_status: int = 200) -> HttpResponse:
+    return rendered_json_response(FastJSONRenderer().render(data), http_status=http_status)
+
+
+def rendered_json_response(body: bytes, *, http_status: int = 200) -> HttpResponse:
+    response = HttpResponse(body, status=http_status, content_type="application/json")
+    response["Vary"] = "Accept"
+    response["Allow"] = ALLOW_HEADER
+    return response
+
+
+def not_modified_response() -> HttpResponse:
+    response = HttpResponse(status=304)
+    # DRF drops Content-Type on empty bodies.
+    del response["Content-Type"]
+    response["Vary"] = "Accept"
+    response["Allow"] = ALLOW_HEADER
+    return response
+
+
+async def aauthenticate(request):
+    """User for the request's bearer token, None without one; `Fallback` if it does not authenticate."""
+
+    jwt_auth = JWTAuthentication()
+    header = jwt_auth.get_header(request)
+    if header is None:
+        return None
+
+    try:
+        raw_token = jwt_auth.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated = jwt_auth.get_validated_token(raw_token)
+        return await sync_to_async(jwt_auth.get_user)(validated)
+    except (AuthenticationFailed, InvalidToken, TokenError) as e:
+        raise Fallback from e
+
+
+def _wants_fast_path(request, kwargs) -> bool:
+    if request.method != "GET" or "format" in kwargs or "format" in request.GET:
+        return False
+    return "text/html" not in request.headers.get("Accept", "")
+
+
+def fast_path(*, role: str | None = None) -> Callable[[FastHandler], FastHandler]:
+    """Mark `async def handler(request, user, **kwargs)` as a fast path.
+
+    With a `role`, the request must carry a valid token for a user with that role;
+    without one the endpoint is public and `user` may be None.
+    """
+
+    def decorator(handler: FastHandler) -> FastHandler:
+        @wraps(handler)
+        async def wrapper(request, **kwargs) -> HttpResponse:
+            user = await aauthenticate(request)
+            if role is not None and getattr(user, "role", None) != role:
+                raise Fallback
+            return await handler(request, user, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _dispatch(handler: FastHandler, fallback: Callable) -> Callable:
+    sync_fallback = sync_to_async(fallback)
+
+    async def view(request, *args, **kwargs) -> HttpResponse:
+        if async_views_enabled() and _wants_fast_path(request, kwargs):
+            try:
+                return await handler(request, *args, **kwargs)
+            except Fallback:
+                pass
+        return await sync_fallback(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    return view
+
+
+def with_fast_paths(urlpatterns: list, handlers: dict[str, FastHandler]) -> list:
+    """Serve the named routes (e.g. from a DRF router) by fast paths, falling back to the original view."""
+
+    if not async_views_enabled():
+        return urlpatterns
+
+    out = []
+    for pattern in urlpatterns:
+        handler = handlers.get(getattr(pattern, "name", None))
+        if isinstance(pattern, URLPattern) and handler is not None:
+            pattern = URLPattern(
+                pattern.pattern,
+                _dispatch(handler, pattern.callback),
+                default_args=pattern.default_args,
+                name=pattern.name,
+            )
+        out.append(pattern)
+    return out
@@ -0,0 +1,181 @@
+"""Read-replica routing for designated read-only service functions.
+
+Only code wrapped in `@replica_read` reads from the `replica` alias (configured by
+READ_REPLICA_URL); everything else, and every write, uses `default`. A lazy QuerySet
+returned by a wrapped function is pinned to the database chosen at call time.
+
+Read-your-writes: ReadReplicaMiddleware notes when a request writes (an INSERT, UPDATE or
+DELETE executed on `default`, seen by a connection execute wrapper) and then keeps that
+user on `default` for READ_REPLICA_STICKY_SECONDS, so a vendor who just accepted an order
+never sees a dashboard from before the write. A request that has written reads its own
+writes from `default` for the rest of the request as well.
+
+Anything that fills a shared cache should read inside `primary_reads()`: a lagging replica
+must not seed a cache entry that every user is then served (see catalog_cache_service).
+"""
+
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.models import QuerySet
+
+
+REPLICA_ALIAS = "replica"
+
+F = TypeVar("F", bound=Callable)
+
+# Savepoints, BEGIN/COMMIT and SELECT ... FOR UPDATE also pass through execute wrappers.
+_WRITE_SQL = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+# None: ordinary reads (default). "replica": inside @replica_read. "primary": inside primary_reads(),
+# which wins over any @replica_read nested in it.
+_read_mode: ContextVar[str | None] = ContextVar("db_read_mode", default=None)
+
+
+class RequestWrites:
+    """Per-request write tracking, installed by ReadReplicaMiddleware."""
+
+    __slots__ = ("request", "wrote", "sticky")
+
+    def __init__(self, request):
+        self.request = request
+        self.wrote = False
+        self.sticky: bool | None = None
+
+
+_request_writes: ContextVar[RequestWrites | None] = ContextVar("db_request_writes", default=None)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def sticky_seconds() -> int:
+    return int(getattr(settings, "READ_REPLICA_STICKY_SECONDS", 5))
+
+
+def sticky_key(user_id) -> str:
+    return f"db_sticky:{user_id}"
+
+
+def _authenticated_user_id(request):
+    # DRF copies the authenticated user onto the underlying HttpRequest.
+    user = getattr(request, "user", None)
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return user.pk
+
+
+def _is_sticky(state: RequestWrites) -> bool:
+    if state.wrote:
+        return True
+    if state.sticky is None:
+        user_id = _authenticated_user_id(state.request)
+        if user_id is None:
+            # Not authenticated (yet): check again on the next read.
+            return False
+        state.sticky = bool(cache.get(sticky_key(user_id)))
+    return state.sticky
+
+
+def read_alias() -> str:
+    if _read_mode.get() != REPLICA_ALIAS or not replica_configured():
+        return DEFAULT_DB_ALIAS
+    state = _request_writes.get()
+    if state is not None and _is_sticky(state):
+        return DEFAULT_DB_ALIAS
+    return REPLICA_ALIAS
+
+
+def replica_read(func: F) -> F:
+    """Run `func`'s reads on the replica (subject to stickiness); pin a returned QuerySet."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _read_mode.set("primary" if _read_mode.get() == "primary" else REPLICA_ALIAS)
+        try:
+            result = func(*args, **kwargs)
+            if isinstance(result, QuerySet):
+                # Evaluated later (pagination, serialization), outside this scope.
+                result = result.using(result.db)
+            return result
+        finally:
+            _read_mode.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+@contextmanager
+def primary_reads():
+    token = _read_mode.set("primary")
+    try:
+        yield
+    finally:
+        _read_mode.reset(token)
+
+
+def _track_writes(execute, sql, params, many, context):
+    state = _request_writes.get()
+    if state is not None and not state.wrote and _WRITE_SQL.match(sql):
+        state.wrote = True
+    return execute(sql, params, many, context)
+
+
+def _install_write_tracker(sender, connection, **kwargs) -> None:
+    if connection.alias == DEFAULT_DB_ALIAS and _track_writes not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_track_writes)
+
+
+connection_created.connect(_install_write_tracker, dispatch_uid="config.db_routing.write_tracker")
+
+
+@contextmanager
+def track_request_writes(request):
+    # The primary connection may already be open in this thread (sync servers, tests).
+    if connections[DEFAULT_DB_ALIAS].connection is not None:
+        _install_write_tracker(None, connections[DEFAULT_DB_ALIAS])
+    state = RequestWrites(request)
+    token = _request_writes.set(state)
+    try:
+        yield state
+    finally:
+        _request_writes.reset(token)
+
+
+def remember_writes(state: RequestWrites) -> None:
+    """After a request that wrote, keep its user on the primary for the sticky window."""
+
+    if not state.wrote:
+        return
+    user_id = _authenticated_user_id(state.request)
+    if user_id is not None and sticky_seconds() > 0:
+        cache.set(sticky_key(user_id), 1, timeout=sticky_seconds())
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so rows loaded from the replica are still saved to the primary. Only
+        # asks where a write would go (callers may never write); see _track_writes.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from replication, not from migrate.
+        return db != REPLICA_ALIAS
@@ -0,0 +1,56 @@
+"""Gunicorn settings for `gunicorn --config config/gunicorn.conf.py`.
+
+Every value comes from config/server.py. ASGI mode (default) runs uvicorn workers that
+serve HTTP and, depending on SERVER_ROLE, WebSockets; SERVER_MODE=wsgi runs the old
+threaded WSGI workers.
+
+On SIGTERM gunicorn stops accepting connections and gives each worker `graceful_timeout`
+seconds: in-flight requests finish and open WebSockets are closed with code 1012
+(service restart), which runs the consumers' disconnect() and tells clients to reconnect.
+
+With PROMETHEUS_MULTIPROC_DIR set, the directory is emptied when gunicorn starts (stale
+files from the last run would otherwise be aggregated) and an exited worker's live gauges
+are dropped; see config/metrics.py.
+"""
+
+import os
+from pathlib import Path
+
+from config.server import server_settings
+
+
+_server = server_settings()
+
+bind = _server.bind
+workers = _server.workers
+timeout = _server.timeout
+keepalive = _server.keepalive
+graceful_timeout = _server.graceful_timeout
+max_requests = _server.max_requests
+max_requests_jitter = _server.max_requests_jitter
+
+if _server.mode == "asgi":
+    worker_class = "config.uvicorn_worker.UvicornWorker"
+    wsgi_app = "config.asgi:application"
+else:
+    worker_class = "gthread"
+    threads = _server.threads
+    wsgi_app = "config.wsgi:application"
+
+
+def on_starting(server):
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        path = Path(multiproc_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        for stale in path.glob("*.db"):
+            stale.unlink()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        try:
+            from prometheus_client import multiprocess
+        except ImportError:
+            return
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,89 @@
+"""Pluggable JSON backend for DRF, Channels consumers and the JSON log formatter.
+
+`JSON_BACKEND = "orjson"` (default) uses orjson when it is installed and falls back to
+the stdlib otherwise; `"json"` forces the stdlib. Both produce the same output for the
+types our API emits: non-native values (Decimal, timedelta, lazy strings, ...) go through
+DRF's own JSONEncoder.default, and aware datetimes render as ISO 8601 with a `Z` suffix.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .profiling import timed_serialization
+
+try:  # Optional dependency.
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj: Any) -> Any:
+    return _drf_encoder.default(obj)
+
+
+@lru_cache(maxsize=1)
+def use_orjson() -> bool:
+    backend = str(getattr(settings, "JSON_BACKEND", "orjson")).strip().lower()
+    return backend == "orjson" and orjson is not None
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON bytes."""
+
+    if use_orjson():
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    return json.dumps(obj, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    if use_orjson():
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by `dumps()`; indented output (browsable API) keeps the stdlib path."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        with timed_serialization():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        if not use_orjson() or self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = dumps(data)
+        # Same as JSONRenderer: escape U+2028/U+2029 so the output is also valid JavaScript.
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not use_orjson():
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
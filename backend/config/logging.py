@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
 from datetime import datetime, timezone
 
+from .jsonlib import dumps_str
+
 
 class JsonFormatter(logging.Formatter):
     """Minimal JSON log formatter (single-line JSON).
@@ -13,7 +20,8 @@ class JsonFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, object] = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            # Event time, not format time: records may be formatted later on a background thread.
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -30,7 +38,25 @@ class JsonFormatter(logging.Formatter):
             "user_id",
             "role",
             "order_id",
+            "product_id",
+            "stock",
+            "quantity",
+            "batch",
+            "committed",
             "event",
+            "pool",
+            "wait_ms",
+            "queued",
+            "active",
+            "max_workers",
+            "db_queries",
+            "db_ms",
+            "cache_hits",
+            "cache_misses",
+            "cache_ms",
+            "serialize_ms",
+            "top_queries",
+            "dropped",
         ):
             if hasattr(record, key):
                 payload[key] = getattr(record, key)
@@ -38,4 +64,142 @@ class JsonFormatter(logging.Formatter):
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
 
-        return json.dumps(payload, ensure_ascii=False)
+        return dumps_str(payload)
+
+
+def parse_sample_rates(value: str | dict | None) -> dict[str, float]:
+    """`"request=0.1,ws_connected=0.25"` -> {"request": 0.1, "ws_connected": 0.25}."""
+
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return {str(k): float(v) for k, v in value.items()}
+    rates: dict[str, float] = {}
+    for item in value.split(","):
+        name, sep, rate = item.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class _BlockingStopListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # The queue may be full; the listener is draining it, so wait for room.
+        self.queue.put(self._sentinel)
+
+
+class BackgroundLogHandler(logging.handlers.QueueHandler):
+    """Queue records and format/write them on a background thread.
+
+    `emit` only samples the record and puts it on a bounded queue, so request threads and
+    the event loop never wait on formatting or stderr. When the queue is full the record
+    is dropped and counted (`log_records_dropped_total` in /api/metrics/); the count is
+    also logged as `log_records_dropped` at most every `drop_report_seconds`.
+
+    `sample_rates` keeps that fraction of the named high-volume INFO/DEBUG messages (by
+    message, e.g. `request`, `ws_connected`); warnings and errors are always kept.
+    The listener starts on first use in each process, so it survives gunicorn's fork.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10000,
+        sample_rates: str | dict | None = None,
+        drop_report_seconds: float = 60.0,
+    ):
+        super().__init__(queue.Queue(maxsize=max(1, int(queue_size))))
+        self.target = logging.StreamHandler()
+        self.sample_rates = parse_sample_rates(sample_rates)
+        self.drop_report_seconds = drop_report_seconds
+        self.dropped = 0
+        self._unreported_drops = 0
+        self._last_drop_report = 0.0
+        self._listener: logging.handlers.QueueListener | None = None
+        self._pid: int | None = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, in the target handler.
+        self.target.setFormatter(fmt)
+
+    def _ensure_listener(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid != pid:
+                # After a fork the parent's listener thread does not exist here.
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+                self._listener = _BlockingStopListener(self.queue, self.target, respect_handler_level=True)
+                self._listener.start()
+                self._pid = pid
+
+    def _sampled_out(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.sample_rates:
+            return False
+        rate = self.sample_rates.get(str(record.msg))
+        return rate is not None and random.random() >= rate
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve what could change before the listener gets to it (message args).
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.put_nowait(record)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._sampled_out(record):
+            return
+        try:
+            self._ensure_listener()
+            self.enqueue(self.prepare(record))
+        except queue.Full:
+            self._drop()
+            return
+        except Exception:
+            self.handleError(record)
+            return
+        if self._unreported_drops:
+            self._report_drops()
+
+    def _drop(self) -> None:
+        self.dropped += 1
+        self._unreported_drops += 1
+        try:
+            from .metrics import record_log_drop
+
+            record_log_drop()
+        except Exception:
+            pass
+
+    def _report_drops(self, *, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_drop_report < self.drop_report_seconds:
+            return
+        count, self._unreported_drops = self._unreported_drops, 0
+        self._last_drop_report = now
+        report = logging.LogRecord(__name__, logging.WARNING, __file__, 0, "log_records_dropped", None, None)
+        report.event = "log_records_dropped"
+        report.dropped = count
+        try:
+            self.enqueue(report)
+        except queue.Full:
+            self._unreported_drops += count
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def close(self) -> None:
+        # Drain what is queued before the process (or a logging reconfigure) drops the handler.
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                if self._unreported_drops:
+                    self._report_drops(force=True)
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+        self.target.close()
+        super().close()
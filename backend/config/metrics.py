@@ -0,0 +1,168 @@
+"""Prometheus metrics: registry, recording helpers and the `/api/metrics/` view.
+
+Recorded once per request by RequestLoggingMiddleware, from the request profile
+(config/profiling.py), so there is no extra work per query or cache call:
+- `http_requests_total` and `http_request_duration_seconds`, labelled by method and
+  resolved route (URL name, e.g. `customer-orders-detail`; never the raw path, so ids
+  in URLs do not create new series).
+- `http_request_db_queries`: queries per request by route, to spot N+1s.
+- `cache_requests_total` by result (hit/miss); hit ratio = hit / (hit + miss).
+- `order_placements_total` by outcome (see CustomerOrderViewSet).
+- `log_records_dropped_total`: log records dropped on a full queue (config/logging.py).
+- `ws_pool_queued`, `ws_pool_active` and `ws_pool_wait_seconds` by realtime pool
+  (ws_realtime/executors.py): calls waiting for a thread, threads busy, time waited.
+
+Multi-process (gunicorn): set PROMETHEUS_MULTIPROC_DIR to an empty, writable directory.
+Every worker then writes its samples there and a scrape of any worker aggregates all of
+them; config/gunicorn.conf.py clears the directory on start and marks exited workers dead.
+
+The endpoint requires `Authorization: Bearer <METRICS_TOKEN>` and is not exposed (404)
+without a token configured. prometheus_client is optional like orjson: without it the
+helpers are no-ops and the endpoint returns 503.
+"""
+
+from __future__ import annotations
+
+import hmac
+import os
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotFound
+
+try:  # Optional dependency.
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # pragma: no cover - exercised only without prometheus_client installed
+    prometheus_client = None
+
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0)
+
+
+if prometheus_client is not None:
+    HTTP_REQUESTS = Counter(
+        "http_requests_total",
+        "HTTP requests by method, resolved route and status code.",
+        ["method", "route", "status"],
+    )
+    HTTP_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by method and resolved route.",
+        ["method", "route"],
+        buckets=LATENCY_BUCKETS,
+    )
+    HTTP_DB_QUERIES = Histogram(
+        "http_request_db_queries",
+        "SQL queries per HTTP request by resolved route.",
+        ["route"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+    CACHE_REQUESTS = Counter(
+        "cache_requests_total",
+        "Cache reads during HTTP requests by result (hit/miss).",
+        ["result"],
+    )
+    ORDER_PLACEMENTS = Counter(
+        "order_placements_total",
+        "Customer order placement attempts by outcome.",
+        ["outcome"],
+    )
+    LOG_RECORDS_DROPPED = Counter(
+        "log_records_dropped",
+        "Log records dropped because the background log queue was full.",
+    )
+    # livesum: summed over live worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+    WS_POOL_QUEUED = Gauge(
+        "ws_pool_queued",
+        "Realtime pool calls waiting for a thread.",
+        ["pool"],
+        multiprocess_mode="livesum",
+    )
+    WS_POOL_ACTIVE = Gauge(
+        "ws_pool_active",
+        "Realtime pool threads running a call.",
+        ["pool"],
+        multiprocess_mode="livesum",
+    )
+    WS_POOL_WAIT = Histogram(
+        "ws_pool_wait_seconds",
+        "Time realtime pool calls waited for a thread.",
+        ["pool"],
+        buckets=POOL_WAIT_BUCKETS,
+    )
+
+
+def metrics_enabled() -> bool:
+    return prometheus_client is not None
+
+
+def route_label(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    # URL names are stable and low-cardinality; fall back to the pattern for unnamed routes.
+    return match.view_name or match.route or UNMATCHED_ROUTE
+
+
+def record_request(request, *, status_code: int | None, duration_s: float, profile) -> None:
+    if prometheus_client is None:
+        return
+    route = route_label(request)
+    method = request.method or ""
+    HTTP_REQUESTS.labels(method, route, str(status_code or 0)).inc()
+    HTTP_LATENCY.labels(method, route).observe(duration_s)
+    HTTP_DB_QUERIES.labels(route).observe(profile.db_queries)
+    if profile.cache_hits:
+        CACHE_REQUESTS.labels("hit").inc(profile.cache_hits)
+    if profile.cache_misses:
+        CACHE_REQUESTS.labels("miss").inc(profile.cache_misses)
+
+
+def record_order_placement(outcome: str) -> None:
+    if prometheus_client is not None:
+        ORDER_PLACEMENTS.labels(outcome).inc()
+
+
+def record_log_drop() -> None:
+    if prometheus_client is not None:
+        LOG_RECORDS_DROPPED.inc()
+
+
+def record_pool_depth(pool: str, *, queued: int, active: int) -> None:
+    if prometheus_client is not None:
+        WS_POOL_QUEUED.labels(pool).set(queued)
+        WS_POOL_ACTIVE.labels(pool).set(active)
+
+
+def record_pool_wait(pool: str, wait_s: float) -> None:
+    if prometheus_client is not None:
+        WS_POOL_WAIT.labels(pool).observe(wait_s)
+
+
+def _authorized(request) -> bool:
+    token = getattr(settings, "METRICS_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    scheme, _, value = header.partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+def metrics_view(request):
+    if not getattr(settings, "METRICS_TOKEN", ""):
+        return HttpResponseNotFound()
+    if not _authorized(request):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = 'Bearer realm="metrics"'
+        return response
+    if prometheus_client is None:
+        return HttpResponse("prometheus_client is not installed\n", status=503, content_type="text/plain")
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(prometheus_client.generate_latest(registry), content_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware capping the HTTP requests one process works on at once.
+
+    Django's ASGI handler runs each request's sync code in a thread of its own, so without a
+    cap a burst of N requests means N threads all waiting on a DB pool of a few connections
+    (and failing with PoolTimeout after DATABASE_POOL_TIMEOUT). Requests over the limit wait
+    here on the event loop instead, which costs no thread and no connection.
+    WebSocket scopes and health checks are not limited.
+    """
+
+    EXEMPT_PATHS = frozenset({"/", "/api/health/"})
+
+    def __init__(self, app, *, limit: int):
+        self.app = app
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if self._semaphore is None or scope["type"] != "http" or scope.get("path") in self.EXEMPT_PATHS:
+            return await self.app(scope, receive, send)
+        async with self._semaphore:
+            return await self.app(scope, receive, send)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.core.exceptions import MiddlewareNotUsed
+
+from config.db_routing import remember_writes, replica_configured, track_request_writes
+
+
+class ReadReplicaMiddleware:
+    """Read-your-writes for replica routing (see config/db_routing.py).
+
+    Tracks whether the request wrote to the primary and, if so, keeps the user's reads on
+    the primary for READ_REPLICA_STICKY_SECONDS. Not installed without a replica.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with track_request_writes(request) as state:
+            try:
+                return self.get_response(request)
+            finally:
+                # Also after an error: whatever was written may already be committed.
+                remember_writes(state)
+
+    async def __acall__(self, request):
+        with track_request_writes(request) as state:
+            try:
+                return await self.get_response(request)
+            finally:
+                if state.wrote:
+                    await sync_to_async(remember_writes)(state)
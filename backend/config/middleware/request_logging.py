@@ -1,58 +1,110 @@
 from __future__ import annotations
 
 import logging
+import random
 import time
 import uuid
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from config.metrics import record_request
+from config.profiling import RequestProfile, end_profile, start_profile
+
 
 logger = logging.getLogger("http")
 
 
 class RequestLoggingMiddleware:
-    """Adds X-Request-ID and logs requests with duration.
+    """Adds X-Request-ID and logs requests with duration and their profile.
 
-    Keeps behavior minimal to avoid breaking existing APIs.
+    Keeps behavior minimal to avoid breaking existing APIs. Runs natively in both sync
+    and async mode so ASGI requests are not pushed onto a thread by this middleware.
+    The profile (SQL, cache, serialization; see config/profiling.py) goes on the log line,
+    in a Server-Timing header, and into a sampled `slow_request` log with the top queries.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        request.request_id = request_id
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
 
-        start = time.perf_counter()
+        request_id, start = self._start(request)
+        profile, token = start_profile()
         try:
             response = self.get_response(request)
         except Exception:
-            duration_ms = int((time.perf_counter() - start) * 1000)
-            logger.exception(
-                "request_error",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.path,
-                    "status_code": 500,
-                    "duration_ms": duration_ms,
-                },
-            )
+            self._log_error(request, request_id, start, profile)
             raise
+        finally:
+            end_profile(token)
+        return self._finish(request, response, request_id, start, profile)
 
-        duration_ms = int((time.perf_counter() - start) * 1000)
-
+    async def __acall__(self, request):
+        request_id, start = self._start(request)
+        profile, token = start_profile()
         try:
-            response["X-Request-ID"] = request_id
+            response = await self.get_response(request)
         except Exception:
-            pass
+            self._log_error(request, request_id, start, profile)
+            raise
+        finally:
+            end_profile(token)
+        return self._finish(request, response, request_id, start, profile)
+
+    @staticmethod
+    def _start(request) -> tuple[str, float]:
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request.request_id = request_id
+        return request_id, time.perf_counter()
 
-        logger.info(
-            "request",
+    @staticmethod
+    def _log_error(request, request_id: str, start: float, profile: RequestProfile) -> None:
+        elapsed = time.perf_counter() - start
+        duration_ms = int(elapsed * 1000)
+        record_request(request, status_code=500, duration_s=elapsed, profile=profile)
+        logger.exception(
+            "request_error",
             extra={
                 "request_id": request_id,
                 "method": request.method,
                 "path": request.path,
-                "status_code": getattr(response, "status_code", None),
+                "status_code": 500,
                 "duration_ms": duration_ms,
+                **profile.log_fields(),
             },
         )
+
+    @staticmethod
+    def _finish(request, response, request_id: str, start: float, profile: RequestProfile):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        duration_ms = int(elapsed_ms)
+
+        try:
+            response["X-Request-ID"] = request_id
+            if settings.SERVER_TIMING_HEADER:
+                response["Server-Timing"] = profile.server_timing(total_ms=elapsed_ms)
+        except Exception:
+            pass
+
+        fields = {
+            "request_id": request_id,
+            "method": request.method,
+            "path": request.path,
+            "status_code": getattr(response, "status_code", None),
+            "duration_ms": duration_ms,
+            **profile.log_fields(),
+        }
+        logger.info("request", extra=fields)
+        record_request(request, status_code=fields["status_code"], duration_s=elapsed_ms / 1000, profile=profile)
+
+        if duration_ms >= settings.SLOW_REQUEST_MS and random.random() < settings.SLOW_REQUEST_LOG_SAMPLE_RATE:
+            logger.warning("slow_request", extra={**fields, "top_queries": profile.top_queries()})
         return response
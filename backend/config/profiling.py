@@ -0,0 +1,142 @@
+"""Per-request profile: SQL queries and DB time, cache hits/misses, serialization time.
+
+RequestLoggingMiddleware starts a profile per request and logs/exports it (log fields,
+`Server-Timing` header, sampled `slow_request` log with the top queries). Collectors
+find the current profile through a context variable, which asgiref copies into
+sync_to_async threads, so queries run by DRF views under ASGI are attributed to the
+request that ran them.
+
+- SQL: an execute wrapper added to every DB connection as it is opened.
+- Cache: the instrumented backends in config/cache_backends.py.
+- Serialization: FastJSONRenderer (response rendering) via `timed_serialization()`.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+
+# Distinct SQL statements tracked per request; enough to rank the worst ones.
+MAX_TRACKED_STATEMENTS = 50
+SQL_PREVIEW_CHARS = 500
+
+
+class RequestProfile:
+    __slots__ = (
+        "db_queries",
+        "db_ms",
+        "cache_hits",
+        "cache_misses",
+        "cache_ms",
+        "serialize_ms",
+        "_statements",
+    )
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_ms = 0.0
+        self.serialize_ms = 0.0
+        # SQL text (with placeholders, so an N+1 collapses into one entry) -> [count, total ms].
+        self._statements: dict[str, list] = {}
+
+    def add_query(self, sql: str, ms: float) -> None:
+        self.db_queries += 1
+        self.db_ms += ms
+        entry = self._statements.get(sql)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] += ms
+        elif len(self._statements) < MAX_TRACKED_STATEMENTS:
+            self._statements[sql] = [1, ms]
+
+    def add_cache(self, *, hits: int, misses: int, ms: float) -> None:
+        self.cache_hits += hits
+        self.cache_misses += misses
+        self.cache_ms += ms
+
+    def top_queries(self, limit: int = 5) -> list[dict]:
+        ranked = sorted(self._statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"sql": sql[:SQL_PREVIEW_CHARS], "count": count, "ms": round(ms, 2)}
+            for sql, (count, ms) in ranked
+        ]
+
+    def log_fields(self) -> dict:
+        return {
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_ms, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_ms": round(self.cache_ms, 2),
+            "serialize_ms": round(self.serialize_ms, 2),
+        }
+
+    def server_timing(self, *, total_ms: float) -> str:
+        return ", ".join(
+            (
+                f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+                f'cache;dur={self.cache_ms:.1f};desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+                f"serialize;dur={self.serialize_ms:.1f}",
+                f"total;dur={total_ms:.1f}",
+            )
+        )
+
+
+_current: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+
+def start_profile() -> tuple[RequestProfile, Token]:
+    # Connections this thread opened before this module was imported (sync servers, tests).
+    for conn in connections.all(initialized_only=True):
+        _install_query_profiler(None, conn)
+    profile = RequestProfile()
+    return profile, _current.set(profile)
+
+
+def end_profile(token: Token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def timed_serialization():
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialize_ms += (time.perf_counter() - start) * 1000
+
+
+def _profile_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.add_query(sql, (time.perf_counter() - start) * 1000)
+
+
+def _install_query_profiler(sender, connection, **kwargs) -> None:
+    # DatabaseWrapper objects are per thread and reconnect (e.g. from the pool) many times.
+    if _profile_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_profile_query)
+
+
+connection_created.connect(_install_query_profiler, dispatch_uid="config.profiling.query_profiler")
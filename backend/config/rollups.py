@@ -0,0 +1,58 @@
+"""Shared plumbing for the incremental order rollups.
+
+VendorDailyStats (vendors/services/vendor_stats_service.py) and RiderEarnings
+(riders/services/rider_earnings_service.py) are both counter rows keyed by an owner and a
+date, updated in the transaction that changes an order and rebuildable from order
+history with `manage.py rebuild_rollups`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def add_to_rollup(model: type[models.Model], *, key: dict, deltas: dict[str, object]) -> None:
+    """Add `deltas` to the `model` row matching `key`, creating it on first use.
+
+    One UPDATE when the row exists; the INSERT runs in a savepoint so a concurrent first
+    insert falls back to the UPDATE. The row stays locked until commit, so call this as late
+    in the transaction as possible.
+    """
+
+    if not deltas:
+        return
+
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    rows = model.objects.filter(**key)
+    if rows.update(**updates, updated_at=timezone.now()):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        rows.update(**updates, updated_at=timezone.now())
+
+
+def delivery_day(tz):
+    """Local delivery date of an order for rebuilds.
+
+    Orders do not store a delivered timestamp; updated_at is used instead, which is exact
+    because delivered is terminal.
+    """
+
+    return TruncDate("updated_at", tzinfo=tz)
+
+
+def replace_rollup_rows(existing: models.QuerySet, rows: Iterable[models.Model]) -> int:
+    """Swap the rows in `existing` for `rows`; call inside a transaction. Returns the count."""
+
+    rows = list(rows)
+    existing.delete()
+    existing.model.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,95 @@
+"""Production server settings, read from the environment in one place.
+
+Used by `config/gunicorn.conf.py` (process model), `config/uvicorn_worker.py` (HTTP and
+WebSocket protocol settings) and `config/asgi.py` (which protocols a process serves).
+Import-light on purpose: the gunicorn master loads it before Django is set up.
+
+Process roles (`SERVER_ROLE`) let HTTP and realtime scale independently:
+- `all` (default): HTTP and WebSockets in the same processes.
+- `http`: REST API only; WebSocket routes are not mounted.
+- `realtime`: WebSockets (plus HTTP, for health checks), with its own worker count.
+
+`SERVER_MODE=wsgi` keeps the previous sync gunicorn setup (HTTP only, no WebSockets).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+
+ROLE_ALL = "all"
+ROLE_HTTP = "http"
+ROLE_REALTIME = "realtime"
+ROLES = (ROLE_ALL, ROLE_HTTP, ROLE_REALTIME)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "").strip()
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name, "").strip()
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    role: str
+    mode: str
+    bind: str
+    workers: int
+    threads: int
+    http_concurrency: int
+    timeout: int
+    keepalive: int
+    graceful_timeout: int
+    max_requests: int
+    max_requests_jitter: int
+    ws_ping_interval: float
+    ws_ping_timeout: float
+
+    @property
+    def serves_websockets(self) -> bool:
+        return self.role in (ROLE_ALL, ROLE_REALTIME)
+
+
+def server_role() -> str:
+    role = os.getenv("SERVER_ROLE", ROLE_ALL).strip().lower() or ROLE_ALL
+    if role not in ROLES:
+        raise ValueError(f"SERVER_ROLE must be one of {', '.join(ROLES)}, got {role!r}")
+    return role
+
+
+def server_settings() -> ServerSettings:
+    role = server_role()
+    mode = os.getenv("SERVER_MODE", "asgi").strip().lower() or "asgi"
+    if mode not in ("asgi", "wsgi"):
+        raise ValueError(f"SERVER_MODE must be asgi or wsgi, got {mode!r}")
+
+    # Realtime processes hold long-lived sockets, so they are sized separately.
+    workers_var = "REALTIME_CONCURRENCY" if role == ROLE_REALTIME else "WEB_CONCURRENCY"
+
+    return ServerSettings(
+        role=role,
+        mode=mode,
+        bind=f"0.0.0.0:{_env_int('PORT', 8000)}",
+        workers=_env_int(workers_var, 2),
+        # ASGI: size of the event loop's default executor (sync_to_async(thread_sensitive=False)
+        # without an executor, run_in_executor(None), DNS lookups). It does not bound sync views:
+        # Django runs each request's sync code (DRF views, ORM) in that request's own thread;
+        # HTTP_CONCURRENCY bounds those. WSGI: gthreads per worker.
+        threads=_env_int("ASGI_THREADS" if mode == "asgi" else "GUNICORN_THREADS", 8 if mode == "asgi" else 2),
+        # ASGI: HTTP requests handled at once per process; the rest queue on the event loop (0 = no cap).
+        # Keep it near DATABASE_POOL_MAX_SIZE so requests do not pile up waiting for a connection.
+        http_concurrency=_env_int("HTTP_CONCURRENCY", 20),
+        timeout=_env_int("GUNICORN_TIMEOUT", 60),
+        keepalive=_env_int("KEEPALIVE_SECONDS", 5),
+        # Time a stopping worker gets to finish requests and close WebSockets before it is killed.
+        graceful_timeout=_env_int("GRACEFUL_TIMEOUT", 30),
+        max_requests=_env_int("GUNICORN_MAX_REQUESTS", 0),
+        max_requests_jitter=_env_int("GUNICORN_MAX_REQUESTS_JITTER", 0),
+        ws_ping_interval=_env_float("WS_PING_INTERVAL", 20.0),
+        ws_ping_timeout=_env_float("WS_PING_TIMEOUT", 20.0),
+    )
@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 
 import dj_database_url
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -67,8 +68,9 @@ AUTHENTICATION_BACKENDS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "config.middleware.static_files.StaticFilesMiddleware",
     "config.middleware.request_logging.RequestLoggingMiddleware",
+    "config.middleware.read_replica.ReadReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -105,14 +107,44 @@ ASGI_APPLICATION = "config.asgi.application"
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 DATABASE_SSL_REQUIRE = _env_bool("DATABASE_SSL_REQUIRE", default=bool(DATABASE_URL))
 
+# Connection strategy (DATABASE_POOL):
+# - psycopg (default): Django's psycopg 3 pool, one per process. Each request or worker thread
+#   borrows a connection and returns it when done, so ASGI/sync_to_async threads do not each
+#   keep their own; the process never holds more than DATABASE_POOL_MAX_SIZE.
+# - pgbouncer: no app-side pooling, connections closed after each request; for an external
+#   transaction-mode pooler (e.g. Supabase Supavisor on port 6543).
+# - persistent: per-thread persistent connections (DATABASE_CONN_MAX_AGE). WSGI only; under
+#   ASGI every short-lived thread leaves a connection behind.
+# Transaction-mode poolers cannot keep server-side cursors open across statements, so they are
+# disabled in pgbouncer mode (DATABASE_DISABLE_SERVER_SIDE_CURSORS to override, e.g. psycopg pool
+# in front of Supavisor). Prepared statements are already off with psycopg 3.
+DATABASE_POOL = os.getenv("DATABASE_POOL", "psycopg").strip().lower()
+if DATABASE_POOL not in {"psycopg", "pgbouncer", "persistent"}:
+    raise RuntimeError("DATABASE_POOL must be psycopg, pgbouncer or persistent")
+
 if DATABASE_URL:
-    DATABASES = {
-        "default": dj_database_url.config(
-            default=DATABASE_URL,
-            conn_max_age=int(os.getenv("DATABASE_CONN_MAX_AGE", "600")),
-            ssl_require=DATABASE_SSL_REQUIRE,
+    _default_db = dj_database_url.config(
+        default=DATABASE_URL,
+        conn_max_age=int(os.getenv("DATABASE_CONN_MAX_AGE", "600")) if DATABASE_POOL == "persistent" else 0,
+        # Ping reused connections (and pooled ones on checkout) so a dropped one is replaced, not used.
+        conn_health_checks=_env_bool("DATABASE_CONN_HEALTH_CHECKS", default=True),
+        ssl_require=DATABASE_SSL_REQUIRE,
+    )
+    # Pool and cursor settings are PostgreSQL-only; other engines (e.g. a sqlite:// URL) reject them.
+    if _default_db["ENGINE"] == "django.db.backends.postgresql":
+        _default_db["DISABLE_SERVER_SIDE_CURSORS"] = _env_bool(
+            "DATABASE_DISABLE_SERVER_SIDE_CURSORS", default=DATABASE_POOL == "pgbouncer"
         )
-    }
+        if DATABASE_POOL == "psycopg":
+            _default_db.setdefault("OPTIONS", {})["pool"] = {
+                "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+                # Seconds a request waits for a free connection before failing.
+                "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+                "max_idle": float(os.getenv("DATABASE_POOL_MAX_IDLE", "300")),
+                "max_lifetime": float(os.getenv("DATABASE_POOL_MAX_LIFETIME", "1800")),
+            }
+    DATABASES = {"default": _default_db}
 else:
     # Local fallback so the project boots without Postgres.
     # Set DATABASE_URL to your Supabase connection string for real environments.
@@ -123,6 +155,27 @@ else:
         }
     }
 
+# Optional read replica for designated read-only service functions (see config/db_routing.py).
+# Same URL formats as DATABASE_URL; for a local test, a second SQLite file copied from the first
+# (e.g. READ_REPLICA_URL=sqlite:///db_replica.sqlite3). Pool settings are shared with the primary.
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL", "")
+# After a user's write, their reads stay on the primary this long (replication lag budget).
+READ_REPLICA_STICKY_SECONDS = int(os.getenv("READ_REPLICA_STICKY_SECONDS", "5"))
+
+if READ_REPLICA_URL:
+    _replica_db = dj_database_url.parse(
+        READ_REPLICA_URL,
+        conn_max_age=DATABASES["default"].get("CONN_MAX_AGE", 0),
+        conn_health_checks=DATABASES["default"].get("CONN_HEALTH_CHECKS", False),
+        ssl_require=DATABASE_SSL_REQUIRE and not READ_REPLICA_URL.startswith("sqlite"),
+    )
+    if _replica_db["ENGINE"] == DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+        _replica_db["DISABLE_SERVER_SIDE_CURSORS"] = DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"]
+        if "pool" in DATABASES["default"].get("OPTIONS", {}):
+            _replica_db.setdefault("OPTIONS", {})["pool"] = dict(DATABASES["default"]["OPTIONS"]["pool"])
+    DATABASES["replica"] = _replica_db
+    DATABASE_ROUTERS = ["config.db_routing.ReplicaRouter"]
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -162,6 +215,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.jsonlib.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.jsonlib.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": int(os.getenv("DRF_PAGE_SIZE", "20")),
     # Throttle rates are only applied to views that explicitly enable throttling.
@@ -172,6 +234,11 @@ REST_FRAMEWORK = {
 }
 
 
+# JSON backend for DRF, WebSocket consumers and JSON logs: "orjson" (falls back to
+# the stdlib if orjson is not installed) or "json".
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson").strip().lower()
+
+
 # Realtime (Redis channel layer)
 REDIS_URL = os.getenv("REDIS_URL", "").strip()
 
@@ -214,18 +281,77 @@ if CHANNEL_LAYERS.get("default", {}).get("BACKEND") == "channels.layers.InMemory
 if REDIS_URL:
     CACHES = {
         "default": {
-            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "BACKEND": "config.cache_backends.ProfiledRedisCache",
             "LOCATION": REDIS_URL,
         }
     }
 else:
     CACHES = {
         "default": {
-            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "BACKEND": "config.cache_backends.ProfiledLocMemCache",
         }
     }
 
 
+# Optional Redis stock reservation layer for hot products (requires REDIS_URL).
+# Reserved stock is reconciled to Product.stock by `manage.py reconcile_stock_reservations`.
+STOCK_RESERVATIONS_ENABLED = _env_bool("STOCK_RESERVATIONS_ENABLED", default=False) and bool(REDIS_URL)
+STOCK_RESERVATION_TTL_SECONDS = int(os.getenv("STOCK_RESERVATION_TTL_SECONDS", "120"))
+
+
+# Server-side cache of rendered public catalog responses (0 disables).
+# Entries are keyed by catalog version, so writes invalidate them immediately.
+CATALOG_CACHE_TTL_SECONDS = int(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+CATALOG_CACHE_LOCK_SECONDS = int(os.getenv("CATALOG_CACHE_LOCK_SECONDS", "5"))
+CATALOG_CACHE_WAIT_MS = int(os.getenv("CATALOG_CACHE_WAIT_MS", "1000"))
+
+
+# Short-TTL cache of the vendor profile looked up on every vendor request (0 disables).
+VENDOR_CACHE_TTL_SECONDS = int(os.getenv("VENDOR_CACHE_TTL_SECONDS", "60"))
+
+
+# Cached pointer to each rider's active order, served to GET /api/orders/assigned-active/
+# polls (0 disables). Moved on commit by every order status change.
+RIDER_ACTIVE_ORDER_CACHE_TTL_SECONDS = int(os.getenv("RIDER_ACTIVE_ORDER_CACHE_TTL_SECONDS", "300"))
+
+
+# Async fast paths for hot read-only endpoints under ASGI (see config/async_views.py).
+ASYNC_VIEWS_ENABLED = _env_bool("ASYNC_VIEWS_ENABLED", default=False)
+
+
+# Dedicated thread pools for WebSocket handshakes (auth) and consumer lookups (data);
+# see ws_realtime/executors.py. Calls that queue longer than the threshold are logged.
+WS_AUTH_THREADS = int(os.getenv("WS_AUTH_THREADS", "4"))
+WS_DATA_THREADS = int(os.getenv("WS_DATA_THREADS", "8"))
+WS_POOL_SLOW_WAIT_MS = float(os.getenv("WS_POOL_SLOW_WAIT_MS", "200"))
+
+
+# Idempotency-Key support for POST /api/customer/orders/ (cache-backed).
+ORDER_IDEMPOTENCY_TTL_SECONDS = int(os.getenv("ORDER_IDEMPOTENCY_TTL_SECONDS", str(60 * 15)))
+ORDER_IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("ORDER_IDEMPOTENCY_LOCK_SECONDS", "30"))
+
+
+# Request profiling (config/profiling.py): query count/DB time, cache hits/misses and
+# serialization time on every `request` log line, and optionally as a Server-Timing header.
+# Requests slower than SLOW_REQUEST_MS also log `slow_request` with their top queries, for a
+# sampled fraction (SLOW_REQUEST_LOG_SAMPLE_RATE, 0..1) so a slow period cannot flood the logs.
+SERVER_TIMING_HEADER = _env_bool("SERVER_TIMING_HEADER", default=True)
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_LOG_SAMPLE_RATE = float(os.getenv("SLOW_REQUEST_LOG_SAMPLE_RATE", "1.0"))
+
+# Bearer token required by GET /api/metrics/ (Prometheus); the endpoint is 404 while unset.
+# Multi-process servers also need PROMETHEUS_MULTIPROC_DIR (see config/metrics.py).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+# Logs are formatted and written on a background thread (config.logging.BackgroundLogHandler)
+# from a bounded queue; records that do not fit are dropped and counted. LOG_SAMPLE_RATES keeps
+# a fraction of high-volume INFO messages, e.g. "request=0.1,ws_connected=0.2" (warnings and
+# errors are never sampled; /api/metrics/ still counts every request).
+LOG_ASYNC = _env_bool("LOG_ASYNC", default=True)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -235,10 +361,19 @@ LOGGING = {
         },
     },
     "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "json",
-        },
+        "console": (
+            {
+                "()": "config.logging.BackgroundLogHandler",
+                "formatter": "json",
+                "queue_size": LOG_QUEUE_SIZE,
+                "sample_rates": LOG_SAMPLE_RATES,
+            }
+            if LOG_ASYNC
+            else {
+                "class": "logging.StreamHandler",
+                "formatter": "json",
+            }
+        ),
     },
     "root": {
         "handlers": ["console"],
@@ -253,6 +388,7 @@ CORS_ALLOWED_ORIGINS = [
 ]
 CORS_ALLOW_ALL_ORIGINS = _env_bool("CORS_ALLOW_ALL_ORIGINS", default=DEBUG and not bool(CORS_ALLOWED_ORIGINS))
 CORS_ALLOW_CREDENTIALS = _env_bool("CORS_ALLOW_CREDENTIALS", default=False)
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 # CSRF trusted origins (if you ever use cookie auth / admin behind proxy)
 CSRF_TRUSTED_ORIGINS = [
@@ -6,6 +6,7 @@ from django.contrib import admin
 from django.urls import include, path
 
 from .health import healthcheck
+from .metrics import metrics_view
 from .ready import readycheck
 
 urlpatterns = [
@@ -13,6 +14,7 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/health/", healthcheck),
     path("api/ready/", readycheck),
+    path("api/metrics/", metrics_view),
     path("api/auth/", include("users.urls")),
     path("api/", include("users.customer_urls")),
     path("api/", include("riders.urls")),
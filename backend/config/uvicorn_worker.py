@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+from config.server import server_settings
+
+
+_server = server_settings()
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Gunicorn worker running config.asgi with the protocol settings from config/server.py."""
+
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "ws": "auto",
+        # Django does not implement the ASGI lifespan protocol.
+        "lifespan": "off",
+        "ws_ping_interval": _server.ws_ping_interval,
+        "ws_ping_timeout": _server.ws_ping_timeout,
+        # Finish draining before gunicorn's graceful_timeout kills the worker.
+        "timeout_graceful_shutdown": max(1, _server.graceful_timeout - 2),
+    }
+
+    async def _serve(self) -> None:
+        # Pool behind sync_to_async(thread_sensitive=False) and run_in_executor(None); Django's
+        # per-request sync code does not run here (see ServerSettings.threads).
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=_server.threads, thread_name_prefix="asgi")
+        )
+        await super()._serve()
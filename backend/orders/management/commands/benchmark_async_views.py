@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import threading
+import time
+import uuid
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from orders.models import Order, OrderItem
+from products.models import Product
+from riders.models import Rider
+from users.models import Address, User
+from vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the ASGI app in-process at high concurrency and compare the sync DRF views with "
+        "the async fast paths (ASYNC_VIEWS_ENABLED off/on) for the hot read endpoints. "
+        "Creates and removes its own fixture rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and mode.")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--keep", action="store_true", help="Keep fixture rows after the run.")
+
+    def handle(self, *args, **options):
+        total: int = options["requests"]
+        concurrency: int = options["concurrency"]
+        if total <= 0 or concurrency <= 0:
+            raise CommandError("--requests and --concurrency must be positive")
+        if not settings.ASYNC_VIEWS_ENABLED:
+            # URL patterns are built at import time; without the flag the fast paths are not routed.
+            raise CommandError("Run with ASYNC_VIEWS_ENABLED=1 so the fast paths are installed.")
+
+        # get_asgi_application() re-runs django.setup(), which re-applies LOGGING; build it first.
+        app = get_asgi_application()
+        http_logger = logging.getLogger("http")
+        http_logger_disabled = http_logger.disabled
+        http_logger.disabled = True
+        fixtures = self._create_fixtures()
+        try:
+            asyncio.run(self._run(app=app, fixtures=fixtures, total=total, concurrency=concurrency))
+        finally:
+            http_logger.disabled = http_logger_disabled
+            if not options["keep"]:
+                # OrderItem.product is PROTECT, so remove orders before the vendor cascade.
+                Order.objects.filter(vendor=fixtures["vendor"]).delete()
+                for user in fixtures["users"]:
+                    user.delete()
+
+    def _create_fixtures(self) -> dict:
+        tag = uuid.uuid4().hex[:8]
+        vendor_user = User.objects.create(phone=f"av{tag}", name="Bench Vendor", role=User.Role.VENDOR)
+        customer = User.objects.create(phone=f"ac{tag}", name="Bench Customer", role=User.Role.CUSTOMER)
+        rider_user = User.objects.create(phone=f"ar{tag}", name="Bench Rider", role=User.Role.RIDER)
+        vendor = Vendor.objects.create(
+            user=vendor_user,
+            shop_name=f"Bench {tag}",
+            address="Benchmark",
+            latitude=Decimal("12.971600"),
+            longitude=Decimal("77.594600"),
+        )
+        rider = Rider.objects.create(user=rider_user)
+        address = Address.objects.create(user=customer, line1="1 Bench St", city="Bengaluru", state="KA", pincode="560001")
+        product = Product.objects.create(vendor=vendor, name="Bench item", price=Decimal("9.99"), stock=100)
+        order = Order.objects.create(
+            customer=customer,
+            vendor=vendor,
+            rider=rider,
+            delivery_address=address,
+            status=Order.Status.ACCEPTED,
+            total_amount=Decimal("19.98"),
+        )
+        OrderItem.objects.create(order=order, product=product, quantity=2, price=Decimal("9.99"))
+
+        def _bearer(user: User) -> tuple[bytes, bytes]:
+            return (b"authorization", f"Bearer {RefreshToken.for_user(user).access_token}".encode())
+
+        return {
+            "vendor": vendor,
+            "users": [vendor_user, customer, rider_user],
+            "endpoints": [
+                ("rider me", "/api/riders/me/", [_bearer(rider_user)]),
+                ("assigned-active", "/api/orders/assigned-active/", [_bearer(rider_user)]),
+                ("order retrieve", f"/api/customer/orders/{order.id}/", [_bearer(customer)]),
+                ("catalog retrieve", f"/api/catalog/products/{product.id}/", []),
+            ],
+        }
+
+    async def _run(self, *, app, fixtures: dict, total: int, concurrency: int) -> None:
+        host = next((h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")), "localhost")
+
+        self.stdout.write(
+            f"{'endpoint':<18} {'mode':<6} {'req/s':>8} {'p50_ms':>8} {'p99_ms':>8} {'threads':>8}  statuses"
+        )
+        for label, path, headers in fixtures["endpoints"]:
+            headers = [(b"host", host.encode()), *headers]
+            for mode in ("sync", "async"):
+                with override_settings(ASYNC_VIEWS_ENABLED=(mode == "async")):
+                    # Warm caches (rider id, active-order pointer, catalog body) outside the timing.
+                    await asgi_get(app, path, headers)
+                    await self._measure(app, label, mode, path, headers, total, concurrency)
+
+    async def _measure(self, app, label, mode, path, headers, total, concurrency) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+        peak_threads = threading.active_count()
+        done = asyncio.Event()
+
+        async def _sample_threads() -> None:
+            nonlocal peak_threads
+            while not done.is_set():
+                peak_threads = max(peak_threads, threading.active_count())
+                await asyncio.sleep(0.001)
+
+        async def _one() -> tuple[int, float]:
+            async with semaphore:
+                return await asgi_get(app, path, headers)
+
+        sampler = asyncio.create_task(_sample_threads())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(_one() for _ in range(total)))
+        wall = time.perf_counter() - start
+        done.set()
+        await sampler
+
+        latencies = sorted(ms for _, ms in results)
+        statuses = sorted({code for code, _ in results})
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{label:<18} {mode:<6} {total / wall:>8.0f} {statistics.median(latencies):>8.1f} {p99:>8.1f} "
+            f"{peak_threads:>8}  {','.join(str(s) for s in statuses)}"
+        )
+
+
+async def asgi_get(app, path: str, headers: list[tuple[bytes, bytes]]) -> tuple[int, float]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+    body_sent = False
+    response_status = 0
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Keep the connection open until the handler cancels its disconnect listener.
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+
+    start = time.perf_counter()
+    await app(scope, receive, send)
+    return response_status, (time.perf_counter() - start) * 1000
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.server import server_settings
+from orders.models import Order, OrderItem
+from products.models import Product
+from riders.models import Rider
+from users.models import Address, User
+from vendors.models import Vendor
+
+from .benchmark_async_views import asgi_get
+
+
+# Client connections to this database, excluding the sampler's own.
+CONNECTIONS_SQL = (
+    "SELECT count(*) FROM pg_stat_activity "
+    "WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()"
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test for the DB connection strategy: N concurrent users hit DB-backed endpoints of the "
+        "ASGI app while pg_stat_activity is sampled. Run once per DATABASE_POOL setting to compare. "
+        "PostgreSQL only. Creates and removes its own fixture rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Concurrent simulated users.")
+        parser.add_argument("--requests", type=int, default=5000, help="Total requests.")
+        parser.add_argument("--sample-interval", type=float, default=0.05, help="Seconds between samples.")
+        parser.add_argument("--keep", action="store_true", help="Keep fixture rows after the run.")
+
+    def handle(self, *args, **options):
+        users: int = options["users"]
+        total: int = options["requests"]
+        if users <= 0 or total <= 0:
+            raise CommandError("--users and --requests must be positive")
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark needs PostgreSQL (set DATABASE_URL).")
+
+        # The full ASGI stack (including HTTP_CONCURRENCY). Importing it re-runs django.setup(),
+        # which re-applies LOGGING, so do it before silencing loggers.
+        from config.asgi import application as app
+        quiet = [logging.getLogger(name) for name in ("http", "django.request")]
+        for logger in quiet:
+            logger.disabled = True
+
+        fixtures = self._create_fixtures()
+        connection.close()
+
+        sampler = _ConnectionSampler(interval=options["sample_interval"])
+        try:
+            baseline = sampler.count()
+            sampler.start()
+            wall, results = asyncio.run(self._run(app=app, endpoints=fixtures["endpoints"], users=users, total=total))
+            sampler.stop()
+            # Give threads that finished their requests a moment to release connections.
+            time.sleep(1.0)
+            after = sampler.count()
+        finally:
+            sampler.close()
+            for logger in quiet:
+                logger.disabled = False
+            if not options["keep"]:
+                # OrderItem.product is PROTECT, so remove orders before the vendor cascade.
+                Order.objects.filter(vendor=fixtures["vendor"]).delete()
+                for user in fixtures["users"]:
+                    user.delete()
+
+        db = settings.DATABASES["default"]
+        pool = db.get("OPTIONS", {}).get("pool")
+        latencies = sorted(ms for _, ms in results)
+        statuses = Counter(code for code, _ in results)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+        self.stdout.write(
+            f"DATABASE_POOL={settings.DATABASE_POOL} pool={pool or '-'} "
+            f"CONN_MAX_AGE={db.get('CONN_MAX_AGE')} HTTP_CONCURRENCY={server_settings().http_concurrency or '-'}"
+        )
+        self.stdout.write(
+            f"users={users} requests={total} req/s={total / wall:.0f} "
+            f"p50_ms={statistics.median(latencies):.1f} p99_ms={p99:.1f} "
+            f"statuses={dict(sorted(statuses.items()))}"
+        )
+        self.stdout.write(
+            f"connections: baseline={baseline} peak={max(sampler.samples, default=baseline)} "
+            f"median={statistics.median(sampler.samples) if sampler.samples else baseline:.0f} after={after}"
+        )
+
+    def _create_fixtures(self) -> dict:
+        tag = uuid.uuid4().hex[:8]
+        vendor_user = User.objects.create(phone=f"dv{tag}", name="Bench Vendor", role=User.Role.VENDOR)
+        customer = User.objects.create(phone=f"dc{tag}", name="Bench Customer", role=User.Role.CUSTOMER)
+        rider_user = User.objects.create(phone=f"dr{tag}", name="Bench Rider", role=User.Role.RIDER)
+        vendor = Vendor.objects.create(
+            user=vendor_user,
+            shop_name=f"Bench {tag}",
+            address="Benchmark",
+            latitude=Decimal("12.971600"),
+            longitude=Decimal("77.594600"),
+        )
+        Rider.objects.create(user=rider_user)
+        address = Address.objects.create(user=customer, line1="1 Bench St", city="Bengaluru", state="KA", pincode="560001")
+        product = Product.objects.create(vendor=vendor, name="Bench item", price=Decimal("9.99"), stock=100)
+        order = Order.objects.create(
+            customer=customer,
+            vendor=vendor,
+            delivery_address=address,
+            total_amount=Decimal("19.98"),
+        )
+        OrderItem.objects.create(order=order, product=product, quantity=2, price=Decimal("9.99"))
+
+        host = next((h for h in settings.ALLOWED_HOSTS if h != "*" and not h.startswith(".")), "localhost")
+
+        def _headers(user: User) -> list[tuple[bytes, bytes]]:
+            token = RefreshToken.for_user(user).access_token
+            return [(b"host", host.encode()), (b"authorization", f"Bearer {token}".encode())]
+
+        return {
+            "vendor": vendor,
+            "users": [vendor_user, customer, rider_user],
+            # Each request authenticates (user lookup) and then reads from the DB.
+            "endpoints": [
+                (f"/api/customer/orders/{order.id}/", _headers(customer)),
+                ("/api/customer/orders/", _headers(customer)),
+                ("/api/riders/me/", _headers(rider_user)),
+            ],
+        }
+
+    async def _run(self, *, app, endpoints: list, users: int, total: int) -> tuple[float, list]:
+        semaphore = asyncio.Semaphore(users)
+
+        async def _one(i: int) -> tuple[int, float]:
+            path, headers = endpoints[i % len(endpoints)]
+            async with semaphore:
+                return await asgi_get(app, path, headers)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(_one(i) for i in range(total)))
+        return time.perf_counter() - start, results
+
+
+class _ConnectionSampler:
+    """Polls pg_stat_activity from a dedicated connection outside Django's pool."""
+
+    def __init__(self, *, interval: float):
+        import psycopg
+
+        params = connection.get_connection_params()
+        self._conn = psycopg.connect(**params, autocommit=True)
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="db-connection-sampler", daemon=True)
+        self.samples: list[int] = []
+
+    def count(self) -> int:
+        return self._conn.execute(CONNECTIONS_SQL).fetchone()[0]
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.samples.append(self.count())
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def close(self) -> None:
+        self.stop()
+        self._conn.close()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from riders.models import Rider
+from riders.services.rider_earnings_service import rebuild_rider_earnings
+from vendors.models import Vendor
+from vendors.services.vendor_stats_service import rebuild_vendor_daily_stats
+
+
+# name -> (owner model, rebuild function taking the owner id, row label)
+ROLLUPS = {
+    "vendor-stats": (Vendor, lambda owner_id: rebuild_vendor_daily_stats(vendor_id=owner_id), "vendor daily stats"),
+    "rider-earnings": (Rider, lambda owner_id: rebuild_rider_earnings(rider_id=owner_id), "rider earnings"),
+}
+
+
+class Command(BaseCommand):
+    help = "Backfill/rebuild the order rollups (VendorDailyStats, RiderEarnings) from order history."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "rollup",
+            choices=[*ROLLUPS, "all"],
+            help="Which rollup to rebuild.",
+        )
+        parser.add_argument(
+            "--id",
+            type=int,
+            default=None,
+            dest="owner_id",
+            help="Optional vendor/rider id; rebuilds only that owner's rows (not with 'all').",
+        )
+
+    def handle(self, *args, **options):
+        name: str = options["rollup"]
+        owner_id: int | None = options.get("owner_id")
+
+        if name == "all" and owner_id is not None:
+            raise CommandError("--id needs a single rollup, not 'all'")
+
+        for rollup in ROLLUPS if name == "all" else [name]:
+            model, rebuild, label = ROLLUPS[rollup]
+            if owner_id is not None and not model.objects.filter(pk=owner_id).exists():
+                raise CommandError(f"{model.__name__} {owner_id} does not exist")
+
+            rows = rebuild(owner_id)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} {label} rows."))
@@ -33,7 +33,7 @@ class OrderSerializer(serializers.ModelSerializer):
     rider_id = serializers.IntegerField(source="rider.id", read_only=True)
     customer_id = serializers.UUIDField(source="customer.id", read_only=True)
     delivery_address_id = serializers.IntegerField(source="delivery_address.id", read_only=True)
-    delivery_address = OrderDeliveryAddressSerializer(source="delivery_address", read_only=True)
+    delivery_address = OrderDeliveryAddressSerializer(read_only=True)
     items = OrderItemSerializer(many=True, read_only=True)
 
     class Meta:
@@ -57,11 +57,148 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+# Fast path for read-only order lists: OrderSerializer(many=True).data built from
+# `values_list()` rows in two queries (orders, items) instead of per-order related lookups.
+
+ORDER_COLUMNS = (
+    "id",
+    "customer_id",
+    "vendor_id",
+    "vendor__shop_name",
+    "rider_id",
+    "delivery_address_id",
+    "delivery_address__label",
+    "delivery_address__receiver_name",
+    "delivery_address__receiver_phone",
+    "delivery_address__line1",
+    "delivery_address__line2",
+    "delivery_address__landmark",
+    "delivery_address__city",
+    "delivery_address__state",
+    "delivery_address__pincode",
+    "status",
+    "total_amount",
+    "payment_method",
+    "payment_status",
+    "created_at",
+    "updated_at",
+)
+
+ORDER_ITEM_COLUMNS = ("order_id", "product_id", "product__name", "quantity", "price")
+# Keeps the IN (...) list within SQLite's parameter limit.
+ORDER_ITEM_BATCH_SIZE = 500
+
+_amount_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+_timestamp_field = serializers.DateTimeField()
+
+
+def order_rows(qs) -> list[dict]:
+    """OrderSerializer(many=True).data for an Order queryset, without model instances."""
+
+    amount = _amount_field.to_representation
+    timestamp = _timestamp_field.to_representation
+
+    orders: list[dict] = []
+    by_id: dict = {}
+    for (
+        order_id,
+        customer_id,
+        vendor_id,
+        vendor_name,
+        rider_id,
+        address_id,
+        label,
+        receiver_name,
+        receiver_phone,
+        line1,
+        line2,
+        landmark,
+        city,
+        state,
+        pincode,
+        status,
+        total_amount,
+        payment_method,
+        payment_status,
+        created_at,
+        updated_at,
+    ) in qs.values_list(*ORDER_COLUMNS):
+        row = {
+            "id": str(order_id),
+            "customer_id": str(customer_id),
+            "vendor_id": vendor_id,
+            "vendor_name": vendor_name,
+            "rider_id": rider_id,
+            "delivery_address_id": address_id,
+            "delivery_address": None
+            if address_id is None
+            else {
+                "id": address_id,
+                "label": label,
+                "receiver_name": receiver_name,
+                "receiver_phone": receiver_phone,
+                "line1": line1,
+                "line2": line2,
+                "landmark": landmark,
+                "city": city,
+                "state": state,
+                "pincode": pincode,
+            },
+            "status": status,
+            "total_amount": amount(total_amount),
+            "payment_method": payment_method,
+            "payment_status": payment_status,
+            "created_at": timestamp(created_at),
+            "updated_at": timestamp(updated_at),
+            "items": [],
+        }
+        # OrderSerializer omits these (dotted source through a null FK) rather than returning null.
+        if rider_id is None:
+            del row["rider_id"]
+        if address_id is None:
+            del row["delivery_address_id"]
+        orders.append(row)
+        by_id[order_id] = row
+
+    order_ids = list(by_id)
+    for start in range(0, len(order_ids), ORDER_ITEM_BATCH_SIZE):
+        items = (
+            OrderItem.objects.filter(order_id__in=order_ids[start : start + ORDER_ITEM_BATCH_SIZE])
+            .order_by("order_id", "id")
+            .values_list(*ORDER_ITEM_COLUMNS)
+        )
+        for order_id, product_id, product_name, quantity, price in items:
+            by_id[order_id]["items"].append(
+                {
+                    "product_id": str(product_id),
+                    "product_name": product_name,
+                    "quantity": quantity,
+                    "price": amount(price),
+                }
+            )
+
+    return orders
+
+
 class EarningsSummarySerializer(serializers.Serializer):
     delivered_orders = serializers.IntegerField()
     total_delivered_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
 
 
+class EarningsSummaryQuerySerializer(serializers.Serializer):
+    range = serializers.ChoiceField(choices=["all", "today", "week", "custom"], required=False, default="all")
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("range") == "custom":
+            if not attrs.get("start") or not attrs.get("end"):
+                raise serializers.ValidationError("start and end are required for a custom range")
+            if attrs["start"] > attrs["end"]:
+                raise serializers.ValidationError("start must be on or before end")
+        return attrs
+
+
 class OrderCreateItemInputSerializer(serializers.Serializer):
     product_id = serializers.UUIDField()
     quantity = serializers.IntegerField(min_value=1)
@@ -1,11 +1,25 @@
 from __future__ import annotations
 
+from config.db_routing import replica_read
 from orders.models import Order
 
 
+@replica_read
 def list_customer_orders(*, customer):
     return Order.objects.filter(customer=customer).order_by("-created_at")
 
 
 def get_customer_order(*, customer, order_id) -> Order:
     return Order.objects.get(customer=customer, pk=order_id)
+
+
+async def aget_customer_order(*, customer, order_id) -> Order:
+    """Order with every relation OrderSerializer reads, so it can be serialized off the ORM thread."""
+
+    order = await (
+        Order.objects.select_related("vendor", "rider", "delivery_address")
+        .prefetch_related("items__product")
+        .aget(customer=customer, pk=order_id)
+    )
+    order.customer = customer
+    return order
@@ -4,14 +4,18 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from decimal import Decimal
 import logging
+import uuid
 
 from django.db import transaction
 
 from orders.models import Order, OrderItem
 from products.models import Product
+from products.services import stock_reservation_service
+from products.services.stock_service import aggregate_quantities, decrement_stock
 from users.models import User
 from users.models import Address
 from vendors.models import Vendor
+from vendors.services.vendor_stats_service import record_order_placed
 
 from .rider_assignment_service import assign_rider_to_order
 from .order_access_service import cache_order_access_from_instance
@@ -46,28 +50,36 @@ def place_order_for_customer(
 
     product_ids = [item.product_id for item in items_list]
 
-    products_qs = Product.objects.select_for_update().filter(
+    # Optimistic read: no row locks here. The guarded UPDATE in decrement_stock()
+    # is the authoritative stock check.
+    products_qs = Product.objects.filter(
         id__in=product_ids,
         vendor=vendor,
         is_active=True,
-    )
+    ).only("id", "price", "stock")
     products_by_id = {str(p.id): p for p in products_qs}
 
     missing = [pid for pid in product_ids if str(pid) not in products_by_id]
     if missing:
         raise ValueError("One or more products are invalid or unavailable")
 
+    if any(item.quantity <= 0 for item in items_list):
+        raise ValueError("Quantity must be >= 1")
+
+    quantities = aggregate_quantities((item.product_id, item.quantity) for item in items_list)
+    use_reservations = stock_reservation_service.reservations_enabled()
+
+    # With reservations enabled, DB stock lags behind Redis; the reservation is the check.
+    if not use_reservations:
+        for product_id, quantity in quantities.items():
+            if products_by_id[product_id].stock < quantity:
+                raise ValueError(f"Insufficient stock for product {product_id}")
+
     order_items: list[OrderItem] = []
     total_amount = Decimal("0")
 
     for item in items_list:
-        if item.quantity <= 0:
-            raise ValueError("Quantity must be >= 1")
-
         product = products_by_id[str(item.product_id)]
-        if product.stock < item.quantity:
-            raise ValueError(f"Insufficient stock for product {product.id}")
-
         price = product.price
         line_total = price * item.quantity
         total_amount += line_total
@@ -80,7 +92,64 @@ def place_order_for_customer(
             )
         )
 
+    order_id = uuid.uuid4()
+    if use_reservations:
+        stock_reservation_service.reserve(
+            reservation_id=str(order_id),
+            quantities=quantities,
+            db_stock={pid: products_by_id[pid].stock for pid in quantities},
+        )
+
+    try:
+        order = _create_order(
+            order_id=order_id,
+            customer=customer,
+            vendor=vendor,
+            order_items=order_items,
+            quantities=quantities,
+            total_amount=total_amount,
+            delivery_address=delivery_address,
+            payment_method=payment_method,
+            use_reservations=use_reservations,
+        )
+    except Exception:
+        if use_reservations:
+            stock_reservation_service.release(reservation_id=str(order_id))
+        raise
+
+    if use_reservations:
+        transaction.on_commit(
+            lambda: stock_reservation_service.confirm(reservation_id=str(order_id), quantities=quantities)
+        )
+
+    # Cache access metadata for websocket authorization (cache-first; avoids consumer DB hits).
+    # Ensure vendor.user is available (Vendor instance is already present here).
+    order.vendor = vendor
+    try:
+        cache_order_access_from_instance(order=order)
+    except Exception:
+        logger.exception(
+            "cache_order_access_failed",
+            extra={"event": "cache_order_access_failed", "order_id": str(order.id), "vendor_id": str(vendor.id)},
+        )
+
+    return order
+
+
+def _create_order(
+    *,
+    order_id: uuid.UUID,
+    customer: User,
+    vendor: Vendor,
+    order_items: list[OrderItem],
+    quantities: dict[str, int],
+    total_amount: Decimal,
+    delivery_address: Address | None,
+    payment_method: str,
+    use_reservations: bool,
+) -> Order:
     order = Order.objects.create(
+        id=order_id,
         customer=customer,
         vendor=vendor,
         delivery_address=delivery_address,
@@ -95,24 +164,16 @@ def place_order_for_customer(
 
     OrderItem.objects.bulk_create(order_items)
 
-    # Reduce stock while holding locks.
-    for item in items_list:
-        product = products_by_id[str(item.product_id)]
-        product.stock -= item.quantity
-        product.save(update_fields=["stock"])
-
     # Best-effort assignment (leaves order.rider null if none).
     assign_rider_to_order(order)
 
-    # Cache access metadata for websocket authorization (cache-first; avoids consumer DB hits).
-    # Ensure vendor.user is available (Vendor instance is already present here).
-    order.vendor = vendor
-    try:
-        cache_order_access_from_instance(order=order)
-    except Exception:
-        logger.exception(
-            "cache_order_access_failed",
-            extra={"event": "cache_order_access_failed", "order_id": str(order.id), "vendor_id": str(vendor.id)},
-        )
+    # Decrement stock late so product row locks are held for as little of the
+    # transaction as possible. Reserved stock is reconciled to the DB asynchronously.
+    if not use_reservations:
+        decrement_stock(vendor=vendor, quantities=quantities)
+
+    # Last: the (vendor, day) rollup row is shared by every order of the vendor, and its
+    # lock is held until commit.
+    record_order_placed(order=order)
 
     return order
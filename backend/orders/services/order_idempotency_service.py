@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    data: Any
+    fingerprint: str
+
+
+def _response_key(*, user_id: str, key: str) -> str:
+    return f"order_idem:{user_id}:{key}"
+
+
+def _lock_key(*, user_id: str, key: str) -> str:
+    return f"order_idem_lock:{user_id}:{key}"
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "ORDER_IDEMPOTENCY_TTL_SECONDS", 60 * 15))
+
+
+def _lock_ttl_seconds() -> int:
+    return int(getattr(settings, "ORDER_IDEMPOTENCY_LOCK_SECONDS", 30))
+
+
+def request_fingerprint(data: Any) -> str:
+    """Stable hash of a request body so a key cannot be reused for a different order."""
+
+    encoded = json.dumps(data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_stored_response(*, user_id: str, key: str) -> StoredResponse | None:
+    value = cache.get(_response_key(user_id=user_id, key=key))
+    if not isinstance(value, dict):
+        return None
+    return StoredResponse(
+        status_code=int(value["status_code"]),
+        data=value["data"],
+        fingerprint=str(value["fingerprint"]),
+    )
+
+
+def store_response(*, user_id: str, key: str, status_code: int, data: Any, fingerprint: str) -> None:
+    cache.set(
+        _response_key(user_id=user_id, key=key),
+        {"status_code": status_code, "data": data, "fingerprint": fingerprint},
+        timeout=_ttl_seconds(),
+    )
+
+
+def acquire_lock(*, user_id: str, key: str) -> bool:
+    """Take the in-flight lock for a key; False if another request holds it."""
+
+    return bool(cache.add(_lock_key(user_id=user_id, key=key), 1, timeout=_lock_ttl_seconds()))
+
+
+def release_lock(*, user_id: str, key: str) -> None:
+    cache.delete(_lock_key(user_id=user_id, key=key))
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
-from decimal import Decimal
+from datetime import date
+from typing import Any, Callable
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Sum
+from django.utils import timezone
 
+from config.db_routing import replica_read
 from orders.models import Order
 from ws_realtime.services.order_events import emit_order_event
 from riders.models import Rider
+from riders.services.rider_earnings_service import (
+    get_day_earnings,
+    get_range_earnings,
+    get_total_earnings,
+    get_week_earnings,
+    record_delivery,
+)
+from vendors.services.vendor_stats_service import record_order_status_change
 
 from .order_access_service import cache_order_access_from_instance
 
@@ -19,6 +32,10 @@ ACTIVE_STATUSES = {
 }
 
 
+# Cache value meaning "this rider has no active order".
+NO_ACTIVE_ORDER = "-"
+
+
 def get_assigned_active_order(rider: Rider) -> Order | None:
     return (
         Order.objects.filter(rider=rider, status__in=list(ACTIVE_STATUSES))
@@ -27,6 +44,138 @@ def get_assigned_active_order(rider: Rider) -> Order | None:
     )
 
 
+def _active_order_ttl() -> int:
+    return int(getattr(settings, "RIDER_ACTIVE_ORDER_CACHE_TTL_SECONDS", 300))
+
+
+def _active_order_key(rider_id) -> str:
+    return f"rider_active_order:{rider_id}"
+
+
+def _active_order_data_key(rider_id) -> str:
+    return f"rider_active_order_data:{rider_id}"
+
+
+def _active_order_pointer(order: Order) -> str:
+    # updated_at moves on every status write, so the pointer also changes when the
+    # same order advances (accepted -> picked) and the cached payload goes stale.
+    return f"{order.pk}:{int(order.updated_at.timestamp() * 1_000_000)}"
+
+
+def track_active_order(*, order: Order) -> None:
+    """Move the rider's active-order pointer after a status write on `order` commits.
+
+    An order that becomes (or stays) active is the rider's most recently updated one, so
+    it becomes the pointer. Any other status clears the pointer instead: the rider may
+    still have another active order, which the next poll looks up once.
+    """
+
+    if not order.rider_id or _active_order_ttl() <= 0:
+        return
+
+    key = _active_order_key(order.rider_id)
+    if order.status in ACTIVE_STATUSES:
+        pointer = _active_order_pointer(order)
+        transaction.on_commit(lambda: cache.set(key, pointer, timeout=_active_order_ttl()))
+    else:
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+def get_assigned_active_order_data(rider: Rider, *, serialize: Callable[[Order], Any]) -> Any | None:
+    """Serialized active order for the polling endpoint, or None when there is none.
+
+    Steady-state polls are two cache reads. The order is loaded by primary key and
+    re-serialized only when the pointer has moved since the last poll.
+    """
+
+    ttl = _active_order_ttl()
+    if ttl <= 0:
+        order = get_assigned_active_order(rider)
+        return serialize(order) if order is not None else None
+
+    key = _active_order_key(rider.id)
+    data_key = _active_order_data_key(rider.id)
+
+    for _ in range(2):
+        pointer = cache.get(key)
+        if pointer is None:
+            order = get_assigned_active_order(rider)
+            pointer = _active_order_pointer(order) if order is not None else NO_ACTIVE_ORDER
+            # add(), not set(): a transition that committed after our read must win.
+            cache.add(key, pointer, timeout=ttl)
+            if order is None:
+                return None
+            data = serialize(order)
+            cache.set(data_key, (pointer, data), timeout=ttl)
+            return data
+
+        if pointer == NO_ACTIVE_ORDER:
+            return None
+
+        cached = cache.get(data_key)
+        if cached is not None and cached[0] == pointer:
+            return cached[1]
+
+        order_id = pointer.split(":", 1)[0]
+        order = Order.objects.filter(pk=order_id, rider_id=rider.id, status__in=list(ACTIVE_STATUSES)).first()
+        if order is not None and _active_order_pointer(order) == pointer:
+            data = serialize(order)
+            cache.set(data_key, (pointer, data), timeout=ttl)
+            return data
+
+        # The pointer lost a race with a later transition; rebuild it from the database.
+        cache.delete(key)
+
+    order = get_assigned_active_order(rider)
+    return serialize(order) if order is not None else None
+
+
+async def aget_assigned_active_order_data(rider: Rider, *, serialize: Callable[[Order], Any]) -> Any | None:
+    """Async `get_assigned_active_order_data`: one batched cache read while the pointer is unchanged.
+
+    A missing or moved pointer is rare (once per transition), so that path reuses the sync
+    implementation rather than duplicating its race handling.
+    """
+
+    if _active_order_ttl() > 0:
+        key = _active_order_key(rider.id)
+        data_key = _active_order_data_key(rider.id)
+        cached = await cache.aget_many([key, data_key])
+        pointer = cached.get(key)
+        if pointer == NO_ACTIVE_ORDER:
+            return None
+        data = cached.get(data_key)
+        if pointer is not None and data is not None and data[0] == pointer:
+            return data[1]
+
+    return await sync_to_async(get_assigned_active_order_data)(rider, serialize=serialize)
+
+
+def transition_order_status(*, order: Order, to_status: str, **fields: Any) -> str:
+    """Move `order` to `to_status` with one conditional UPDATE; return the previous status.
+
+    The UPDATE only matches while the row still has the status (and rider) it was read
+    with, so of two concurrent transitions exactly one succeeds and the other raises
+    ValueError. Rollups and other side effects must run only after this returns.
+    """
+
+    from_status = order.status
+    now = timezone.now()
+    updated = Order.objects.filter(pk=order.pk, status=from_status, rider_id=order.rider_id).update(
+        status=to_status,
+        updated_at=now,
+        **fields,
+    )
+    if updated != 1:
+        raise ValueError("Order was updated by another request; reload it and try again")
+
+    order.status = to_status
+    order.updated_at = now
+    for name, value in fields.items():
+        setattr(order, name, value)
+    return from_status
+
+
 @transaction.atomic
 def accept_order(*, rider: Rider, order: Order) -> Order:
     if order.rider_id and order.rider_id != rider.id:
@@ -35,9 +184,9 @@ def accept_order(*, rider: Rider, order: Order) -> Order:
     if order.status != Order.Status.PLACED:
         raise ValueError("Only placed orders can be accepted")
 
-    order.rider = rider
-    order.status = Order.Status.ACCEPTED
-    order.save(update_fields=["rider", "status", "updated_at"])
+    from_status = transition_order_status(order=order, to_status=Order.Status.ACCEPTED, rider=rider)
+    record_order_status_change(order=order, from_status=from_status)
+    track_active_order(order=order)
 
     order_id = str(order.id)
     rider_id = str(rider.id)
@@ -72,8 +221,9 @@ def mark_picked(*, rider: Rider, order: Order) -> Order:
     if order.status not in {Order.Status.ACCEPTED, Order.Status.READY}:
         raise ValueError("Order must be accepted/ready before it can be picked")
 
-    order.status = Order.Status.PICKED
-    order.save(update_fields=["status", "updated_at"])
+    from_status = transition_order_status(order=order, to_status=Order.Status.PICKED)
+    record_order_status_change(order=order, from_status=from_status)
+    track_active_order(order=order)
 
     order_id = str(order.id)
     rider_id = str(rider.id)
@@ -106,8 +256,10 @@ def mark_delivered(*, rider: Rider, order: Order) -> Order:
     if order.status != Order.Status.PICKED:
         raise ValueError("Order must be picked before it can be delivered")
 
-    order.status = Order.Status.DELIVERED
-    order.save(update_fields=["status", "updated_at"])
+    from_status = transition_order_status(order=order, to_status=Order.Status.DELIVERED)
+    record_order_status_change(order=order, from_status=from_status)
+    track_active_order(order=order)
+    record_delivery(rider=rider, amount=order.total_amount, delivered_at=order.updated_at)
 
     order_id = str(order.id)
     rider_id = str(rider.id)
@@ -133,11 +285,24 @@ def mark_delivered(*, rider: Rider, order: Order) -> Order:
     return order
 
 
-def earnings_summary(rider: Rider) -> dict:
-    delivered = Order.objects.filter(rider=rider, status=Order.Status.DELIVERED)
-    count = delivered.count()
-    total = delivered.aggregate(total=Sum("total_amount"))["total"] or Decimal("0")
-    return {
-        "delivered_orders": count,
-        "total_delivered_amount": total,
-    }
+@replica_read
+def earnings_summary(
+    rider: Rider,
+    *,
+    range_name: str = "all",
+    start: date | None = None,
+    end: date | None = None,
+) -> dict:
+    """Read delivered-order totals from the rider earnings ledger (no order scan)."""
+
+    if range_name == "all":
+        return get_total_earnings(rider=rider)
+    if range_name == "today":
+        return get_day_earnings(rider=rider)
+    if range_name == "week":
+        return get_week_earnings(rider=rider)
+    if range_name == "custom":
+        if start is None or end is None:
+            raise ValueError("start and end are required for a custom range")
+        return get_range_earnings(rider=rider, start=start, end=end)
+    raise ValueError("Invalid earnings range")
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
+from config.db_routing import replica_read
 from orders.models import Order
+from products.services.stock_service import return_order_stock
 from ws_realtime.services.order_events import emit_order_event
 from vendors.services.vendor_service import get_vendor_for_user
+from vendors.services.vendor_stats_service import record_order_status_change
 
 from .order_access_service import cache_order_access_from_instance
+from .order_service import track_active_order, transition_order_status
 
 
+@replica_read
 def list_vendor_orders(*, user, status: str | None = None):
     vendor = get_vendor_for_user(user=user)
     qs = Order.objects.filter(vendor=vendor).order_by("-created_at")
@@ -29,8 +35,10 @@ def mark_vendor_order_ready(*, user, order_id) -> Order:
     if order.status not in {Order.Status.PLACED, Order.Status.ACCEPTED}:
         raise ValueError("Order must be placed/accepted before it can be marked ready")
 
-    order.status = Order.Status.READY
-    order.save(update_fields=["status", "updated_at"])
+    with transaction.atomic():
+        from_status = transition_order_status(order=order, to_status=Order.Status.READY)
+        record_order_status_change(order=order, from_status=from_status)
+        track_active_order(order=order)
 
     order.vendor = vendor
     cache_order_access_from_instance(order=order)
@@ -50,8 +58,13 @@ def cancel_vendor_order(*, user, order_id) -> Order:
     if order.status in {Order.Status.PICKED, Order.Status.DELIVERED}:
         raise ValueError("Picked/delivered orders cannot be cancelled")
 
-    order.status = Order.Status.CANCELLED
-    order.save(update_fields=["status", "updated_at"])
+    # Cancelling twice is a no-op: no counters move and stock is returned only once.
+    if order.status != Order.Status.CANCELLED:
+        with transaction.atomic():
+            from_status = transition_order_status(order=order, to_status=Order.Status.CANCELLED)
+            record_order_status_change(order=order, from_status=from_status)
+            track_active_order(order=order)
+            return_order_stock(order=order)
 
     order.vendor = vendor
     cache_order_access_from_instance(order=order)
@@ -71,8 +84,10 @@ def accept_vendor_order(*, user, order_id) -> Order:
     if order.status != Order.Status.PLACED:
         raise ValueError("Only placed orders can be accepted")
 
-    order.status = Order.Status.ACCEPTED
-    order.save(update_fields=["status", "updated_at"])
+    with transaction.atomic():
+        from_status = transition_order_status(order=order, to_status=Order.Status.ACCEPTED)
+        record_order_status_change(order=order, from_status=from_status)
+        track_active_order(order=order)
 
     order.vendor = vendor
     cache_order_access_from_instance(order=order)
@@ -94,8 +109,11 @@ def reject_vendor_order(*, user, order_id) -> Order:
     if order.status == Order.Status.CANCELLED:
         raise ValueError("Order is already cancelled")
 
-    order.status = Order.Status.CANCELLED
-    order.save(update_fields=["status", "updated_at"])
+    with transaction.atomic():
+        from_status = transition_order_status(order=order, to_status=Order.Status.CANCELLED)
+        record_order_status_change(order=order, from_status=from_status)
+        track_active_order(order=order)
+        return_order_stock(order=order)
 
     order.vendor = vendor
     cache_order_access_from_instance(order=order)
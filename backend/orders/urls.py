@@ -1,6 +1,14 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import CustomerOrderViewSet, OrderViewSet, VendorOrderViewSet
+from config.async_views import with_fast_paths
+
+from .views import (
+    CustomerOrderViewSet,
+    OrderViewSet,
+    VendorOrderViewSet,
+    assigned_active_fast,
+    customer_order_detail_fast,
+)
 
 router = DefaultRouter()
 router.register(r"orders", OrderViewSet, basename="orders")
@@ -8,4 +16,10 @@ router.register(r"customer/orders", CustomerOrderViewSet, basename="customer-ord
 router.register(r"orders/vendor", VendorOrderViewSet, basename="orders-vendor")
 router.register(r"vendor/orders", VendorOrderViewSet, basename="vendor-orders")
 
-urlpatterns = router.urls
+urlpatterns = with_fast_paths(
+    router.urls,
+    {
+        "orders-assigned-active": assigned_active_fast,
+        "customer-orders-detail": customer_order_detail_fast,
+    },
+)
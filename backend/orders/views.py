@@ -1,21 +1,46 @@
 from __future__ import annotations
 
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from riders.services.rider_service import get_or_create_rider_for_user
+from config.async_views import Fallback, fast_path, json_response
+from config.metrics import record_order_placement
+from riders.services.rider_service import aget_rider_ref_for_user, get_rider_ref_for_user
 from users.permissions import IsCustomer, IsRider
 from vendors.permissions import IsVendor
 from vendors.models import Vendor
 from users.models import Address
 
 from .models import Order
-from .serializers import EarningsSummarySerializer, OrderCreateSerializer, OrderSerializer
-from .services.customer_order_service import get_customer_order, list_customer_orders
+from .serializers import (
+    EarningsSummaryQuerySerializer,
+    EarningsSummarySerializer,
+    OrderCreateSerializer,
+    OrderSerializer,
+    order_rows,
+)
+from .services.customer_order_service import aget_customer_order, get_customer_order, list_customer_orders
 from .services.order_creation_service import OrderItemInput, place_order_for_customer
-from .services.order_service import accept_order, earnings_summary, get_assigned_active_order, mark_delivered, mark_picked
+from .services.order_idempotency_service import (
+    MAX_IDEMPOTENCY_KEY_LENGTH,
+    acquire_lock,
+    get_stored_response,
+    release_lock,
+    request_fingerprint,
+    store_response,
+)
+from .services.order_service import (
+    accept_order,
+    aget_assigned_active_order_data,
+    earnings_summary,
+    get_assigned_active_order_data,
+    mark_delivered,
+    mark_picked,
+)
 from .services.vendor_order_service import (
     accept_vendor_order,
     cancel_vendor_order,
@@ -44,7 +69,7 @@ class VendorOrderViewSet(viewsets.ViewSet):
         except Exception:
             return _vendor_error("Vendor profile not found", http_status=status.HTTP_404_NOT_FOUND)
 
-        return _vendor_success(OrderSerializer(qs, many=True).data)
+        return _vendor_success(order_rows(qs))
 
     def retrieve(self, request, pk=None):
         try:
@@ -99,19 +124,24 @@ class VendorOrderViewSet(viewsets.ViewSet):
         return _vendor_success(OrderSerializer(order).data)
 
 
+def _serialize_order(order: Order) -> dict:
+    return OrderSerializer(order).data
+
+
 class OrderViewSet(viewsets.ViewSet):
     permission_classes = [IsRider]
 
     def _get_rider(self, request):
-        return get_or_create_rider_for_user(request.user)
+        # Only the rider's identity is needed here; see get_rider_ref_for_user.
+        return get_rider_ref_for_user(request.user)
 
     @action(detail=False, methods=["get"], url_path="assigned-active")
     def assigned_active(self, request):
         rider = self._get_rider(request)
-        order = get_assigned_active_order(rider)
-        if not order:
+        data = get_assigned_active_order_data(rider, serialize=_serialize_order)
+        if data is None:
             return Response({"detail": "No active order"}, status=status.HTTP_404_NOT_FOUND)
-        return Response(OrderSerializer(order).data)
+        return Response(data)
 
     @action(detail=True, methods=["post"], url_path="accept")
     def accept(self, request, pk=None):
@@ -146,16 +176,42 @@ class OrderViewSet(viewsets.ViewSet):
     @action(detail=False, methods=["get"], url_path="earnings-summary")
     def earnings(self, request):
         rider = self._get_rider(request)
-        data = earnings_summary(rider)
+        query = EarningsSummaryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = earnings_summary(
+            rider,
+            range_name=query.validated_data["range"],
+            start=query.validated_data.get("start"),
+            end=query.validated_data.get("end"),
+        )
         return Response(EarningsSummarySerializer(data).data)
 
 
+def _placement_outcome(response) -> str:
+    if response.status_code == status.HTTP_201_CREATED:
+        return "replayed" if response.get("Idempotent-Replayed") else "placed"
+    return {
+        status.HTTP_400_BAD_REQUEST: "rejected",
+        status.HTTP_401_UNAUTHORIZED: "unauthorized",
+        status.HTTP_403_FORBIDDEN: "forbidden",
+        status.HTTP_404_NOT_FOUND: "not_found",
+        status.HTTP_409_CONFLICT: "in_progress",
+        status.HTTP_422_UNPROCESSABLE_ENTITY: "key_reused",
+    }.get(response.status_code, "error")
+
+
 class CustomerOrderViewSet(viewsets.ViewSet):
     permission_classes = [IsCustomer]
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Seen here, after DRF's exception handling, so validation errors are counted too.
+        if self.action == "create":
+            record_order_placement(_placement_outcome(response))
+        return super().finalize_response(request, response, *args, **kwargs)
+
     def list(self, request):
         qs = list_customer_orders(customer=request.user)
-        return Response(OrderSerializer(qs, many=True).data)
+        return Response(order_rows(qs))
 
     def retrieve(self, request, pk=None):
         try:
@@ -165,6 +221,48 @@ class CustomerOrderViewSet(viewsets.ViewSet):
         return Response(OrderSerializer(order).data)
 
     def create(self, request):
+        key = (request.headers.get("Idempotency-Key") or "").strip()
+        if not key:
+            return self._create(request)
+
+        if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return Response({"detail": "Idempotency-Key is too long"}, status=status.HTTP_400_BAD_REQUEST)
+
+        user_id = str(request.user.id)
+        fingerprint = request_fingerprint(request.data)
+
+        stored = get_stored_response(user_id=user_id, key=key)
+        if stored is None:
+            if not acquire_lock(user_id=user_id, key=key):
+                return Response(
+                    {"detail": "A request with this Idempotency-Key is already in progress"},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            try:
+                # Re-check: the first request may have finished between the lookup and the lock.
+                stored = get_stored_response(user_id=user_id, key=key)
+                if stored is None:
+                    response = self._create(request)
+                    if status.is_success(response.status_code):
+                        store_response(
+                            user_id=user_id,
+                            key=key,
+                            status_code=response.status_code,
+                            data=response.data,
+                            fingerprint=fingerprint,
+                        )
+                    return response
+            finally:
+                release_lock(user_id=user_id, key=key)
+
+        if stored.fingerprint != fingerprint:
+            return Response(
+                {"detail": "Idempotency-Key was already used with a different request"},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return Response(stored.data, status=stored.status_code, headers={"Idempotent-Replayed": "true"})
+
+    def _create(self, request):
         serializer = OrderCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -192,3 +290,24 @@ class CustomerOrderViewSet(viewsets.ViewSet):
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
+
+
+@fast_path(role="rider")
+async def assigned_active_fast(request, user) -> HttpResponse:
+    rider = await aget_rider_ref_for_user(user)
+    data = await aget_assigned_active_order_data(rider, serialize=_serialize_order)
+    if data is None:
+        return json_response({"detail": "No active order"}, http_status=status.HTTP_404_NOT_FOUND)
+    return json_response(data)
+
+
+@fast_path(role="customer")
+async def customer_order_detail_fast(request, user, pk=None) -> HttpResponse:
+    try:
+        order = await aget_customer_order(customer=user, order_id=pk)
+    except Order.DoesNotExist:
+        return json_response({"detail": "Order not found"}, http_status=status.HTTP_404_NOT_FOUND)
+    except ValidationError:
+        # Malformed id: keep whatever the DRF view answers.
+        raise Fallback
+    return json_response(OrderSerializer(order).data)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from rest_framework.renderers import JSONRenderer
+
+from orders.models import Order, OrderItem
+from orders.serializers import ORDER_ITEM_BATCH_SIZE, OrderSerializer, order_rows
+from products.models import Product
+from products.serializers import CATALOG_PRODUCT_COLUMNS, CatalogProductSerializer, catalog_product_rows
+from users.models import Address, User
+from vendors.models import Vendor
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _prefetched_orders(qs) -> list[Order]:
+    # Best case for the DRF path: no N+1. Prefetch in batches (SQLite chokes on huge IN lists).
+    orders = list(qs.select_related("vendor", "customer", "rider", "delivery_address"))
+    for start in range(0, len(orders), ORDER_ITEM_BATCH_SIZE):
+        prefetch_related_objects(orders[start : start + ORDER_ITEM_BATCH_SIZE], "items__product")
+    return orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF ModelSerializers with the values_list() fast path for catalog and order lists. "
+        "Fixture rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", default="100,1000,10000", help="Comma-separated list sizes.")
+        parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing per measurement.")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in str(options["rows"]).split(",") if s.strip()]
+        except ValueError:
+            raise CommandError("--rows must be a comma-separated list of integers")
+        if not sizes or min(sizes) <= 0 or options["repeat"] <= 0:
+            raise CommandError("--rows and --repeat must be positive")
+
+        try:
+            with transaction.atomic():
+                self._run(sizes=sizes, repeat=options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, *, sizes: list[int], repeat: int) -> None:
+        largest = max(sizes)
+        tag = uuid.uuid4().hex[:8]
+        vendor_user = User.objects.create(phone=f"sv{tag}", name="Bench Vendor", role=User.Role.VENDOR)
+        customer = User.objects.create(phone=f"sc{tag}", name="Bench Customer", role=User.Role.CUSTOMER)
+        vendor = Vendor.objects.create(
+            user=vendor_user,
+            shop_name=f"Bench {tag}",
+            address="Benchmark",
+            latitude=Decimal("12.971600"),
+            longitude=Decimal("77.594600"),
+        )
+        address = Address.objects.create(user=customer, line1="1 Bench St", city="Bengaluru", state="KA", pincode="560001")
+
+        products = Product.objects.bulk_create(
+            [
+                Product(vendor=vendor, name=f"Item {i:05d}", description="Benchmark item", price=Decimal("9.99"), stock=10)
+                for i in range(largest)
+            ]
+        )
+        orders = Order.objects.bulk_create(
+            [
+                Order(customer=customer, vendor=vendor, delivery_address=address, total_amount=Decimal("19.98"))
+                for _ in range(largest)
+            ]
+        )
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=o, product=p, quantity=2, price=Decimal("9.99")) for o, p in zip(orders, products)]
+        )
+
+        self.stdout.write(f"{'list':<8} {'rows':>6} {'drf_ms':>9} {'fast_ms':>9} {'speedup':>8}  same_json")
+        for size in sizes:
+            catalog_qs = Product.objects.filter(vendor=vendor).select_related("vendor").order_by("name", "id")[:size]
+            self._compare(
+                label="catalog",
+                size=size,
+                repeat=repeat,
+                drf=lambda: CatalogProductSerializer(list(catalog_qs), many=True).data,
+                fast=lambda: catalog_product_rows(catalog_qs.values_list(*CATALOG_PRODUCT_COLUMNS)),
+            )
+
+            order_qs = Order.objects.filter(vendor=vendor).order_by("-created_at", "id")[:size]
+            self._compare(
+                label="orders",
+                size=size,
+                repeat=repeat,
+                drf=lambda: OrderSerializer(_prefetched_orders(order_qs), many=True).data,
+                fast=lambda: order_rows(order_qs),
+            )
+
+    def _time(self, fn, repeat: int) -> tuple[float, bytes]:
+        best = float("inf")
+        body = b""
+        for _ in range(repeat):
+            start = time.perf_counter()
+            body = JSONRenderer().render(fn())
+            best = min(best, (time.perf_counter() - start) * 1000)
+        return best, body
+
+    def _compare(self, *, label: str, size: int, repeat: int, drf, fast) -> None:
+        drf_ms, drf_body = self._time(drf, repeat)
+        fast_ms, fast_body = self._time(fast, repeat)
+        speedup = drf_ms / fast_ms if fast_ms else 0.0
+        self.stdout.write(
+            f"{label:<8} {size:>6} {drf_ms:>9.1f} {fast_ms:>9.1f} {speedup:>7.1f}x  {drf_body == fast_body}"
+        )
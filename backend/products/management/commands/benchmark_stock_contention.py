@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from orders.models import Order
+from orders.services.order_creation_service import OrderItemInput, place_order_for_customer
+from products.models import Product
+from products.services import stock_reservation_service
+from users.models import User
+from vendors.models import Vendor
+
+
+class Command(BaseCommand):
+    help = (
+        "Contention benchmark: N concurrent buyers ordering one SKU. Compares the DB stock path "
+        "with the Redis reservation layer. Creates and removes its own fixture rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buyers", type=int, default=200)
+        parser.add_argument("--stock", type=int, default=100, help="Initial stock of the hot SKU.")
+        parser.add_argument("--mode", choices=["db", "redis", "both"], default="both")
+        parser.add_argument("--keep", action="store_true", help="Keep fixture rows after the run.")
+
+    def handle(self, *args, **options):
+        buyers: int = options["buyers"]
+        stock: int = options["stock"]
+        modes = ["db", "redis"] if options["mode"] == "both" else [options["mode"]]
+
+        if buyers <= 0 or stock < 0:
+            raise CommandError("--buyers must be > 0 and --stock >= 0")
+
+        for mode in modes:
+            if mode == "redis" and not settings.REDIS_URL:
+                self.stdout.write(self.style.WARNING("Skipping redis mode: REDIS_URL is not set"))
+                continue
+            with override_settings(STOCK_RESERVATIONS_ENABLED=(mode == "redis")):
+                self._run(mode=mode, buyers=buyers, stock=stock, keep=bool(options["keep"]))
+
+    def _run(self, *, mode: str, buyers: int, stock: int, keep: bool) -> None:
+        tag = uuid.uuid4().hex[:8]
+        vendor_user = User.objects.create(phone=f"bv{tag}", name="Bench Vendor", role=User.Role.VENDOR)
+        customer = User.objects.create(phone=f"bc{tag}", name="Bench Customer", role=User.Role.CUSTOMER)
+        vendor = Vendor.objects.create(
+            user=vendor_user,
+            shop_name=f"Bench {tag}",
+            address="Benchmark",
+            latitude=Decimal("12.971600"),
+            longitude=Decimal("77.594600"),
+        )
+        product = Product.objects.create(vendor=vendor, name="Hot SKU", price=Decimal("10.00"), stock=stock)
+
+        barrier = threading.Barrier(buyers)
+        items = [OrderItemInput(product_id=str(product.id), quantity=1)]
+
+        def _buy() -> tuple[str, float]:
+            barrier.wait()
+            start = time.perf_counter()
+            try:
+                place_order_for_customer(customer=customer, vendor=vendor, items=items)
+                outcome = "ok"
+            except ValueError:
+                outcome = "sold_out"
+            except Exception as e:  # noqa: BLE001
+                outcome = f"error:{type(e).__name__}"
+            finally:
+                connection.close()
+            return outcome, (time.perf_counter() - start) * 1000
+
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=buyers) as pool:
+            results = list(pool.map(lambda _i: _buy(), range(buyers)))
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+
+        if mode == "redis":
+            stock_reservation_service.reconcile()
+
+        product.refresh_from_db()
+        ok = sum(1 for outcome, _ in results if outcome == "ok")
+        sold_out = sum(1 for outcome, _ in results if outcome == "sold_out")
+        errors = buyers - ok - sold_out
+        orders = Order.objects.filter(vendor=vendor).count()
+        latencies = sorted(ms for _, ms in results)
+
+        def _pct(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+        self.stdout.write(
+            f"[{mode}] buyers={buyers} stock={stock} ok={ok} sold_out={sold_out} errors={errors} "
+            f"orders={orders} final_stock={product.stock} wall_ms={wall_ms:.0f} "
+            f"throughput={ok / (wall_ms / 1000) if wall_ms else 0:.1f}/s "
+            f"p50={statistics.median(latencies):.1f}ms p95={_pct(0.95):.1f}ms p99={_pct(0.99):.1f}ms"
+        )
+        if product.stock != stock - ok or orders != ok:
+            self.stdout.write(self.style.ERROR(f"[{mode}] stock mismatch: oversell or lost update detected"))
+
+        error_kinds = sorted({outcome for outcome, _ in results if outcome.startswith("error:")})
+        if error_kinds:
+            self.stdout.write(self.style.WARNING(f"[{mode}] errors: {', '.join(error_kinds)}"))
+
+        if not keep:
+            # OrderItem.product is PROTECT, so remove orders before the vendor cascade.
+            Order.objects.filter(vendor=vendor).delete()
+            vendor_user.delete()
+            customer.delete()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.services import stock_reservation_service
+
+
+class Command(BaseCommand):
+    help = "Release expired stock reservations and apply reserved quantities to Product.stock."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=2.0)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        loop: bool = bool(options["loop"])
+        interval: float = options["interval"]
+        batch_size: int = options["batch_size"]
+
+        if not stock_reservation_service.reservations_enabled():
+            if not loop:
+                raise CommandError("Stock reservations are disabled (set STOCK_RESERVATIONS_ENABLED and REDIS_URL)")
+            # The Procfile worker always runs; idle instead of exiting so it is not restarted in a loop.
+            self.stdout.write("Stock reservations are disabled; nothing to reconcile.")
+            self.stdout.flush()
+            while True:
+                time.sleep(3600)
+
+        while True:
+            released = stock_reservation_service.sweep_expired()
+            applied = stock_reservation_service.reconcile(batch_size=batch_size)
+            if released or applied or not loop:
+                self.stdout.write(f"released={released} reconciled_products={applied}")
+            if not loop:
+                return
+            time.sleep(interval)
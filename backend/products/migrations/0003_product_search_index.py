@@ -0,0 +1,82 @@
+from django.db import migrations
+
+
+# Catalog full-text search (see products/services/product_search_service.py).
+# PostgreSQL: stored generated tsvector column + GIN index.
+# SQLite (local dev): FTS5 table kept in sync by triggers.
+
+PG_FORWARD = [
+    """
+    ALTER TABLE products_product ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX product_search_vector_idx ON products_product USING gin (search_vector)",
+]
+
+PG_REVERSE = [
+    "DROP INDEX IF EXISTS product_search_vector_idx",
+    "ALTER TABLE products_product DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE products_product_fts USING fts5(
+        product_id UNINDEXED, name, description, tokenize = 'unicode61'
+    )
+    """,
+    """
+    INSERT INTO products_product_fts (product_id, name, description)
+    SELECT id, name, description FROM products_product
+    """,
+    """
+    CREATE TRIGGER products_product_fts_ai AFTER INSERT ON products_product BEGIN
+        INSERT INTO products_product_fts (product_id, name, description)
+        VALUES (NEW.id, NEW.name, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER products_product_fts_ad AFTER DELETE ON products_product BEGIN
+        DELETE FROM products_product_fts WHERE product_id = OLD.id;
+    END
+    """,
+    """
+    CREATE TRIGGER products_product_fts_au AFTER UPDATE OF name, description ON products_product BEGIN
+        UPDATE products_product_fts SET name = NEW.name, description = NEW.description
+        WHERE product_id = NEW.id;
+    END
+    """,
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS products_product_fts_au",
+    "DROP TRIGGER IF EXISTS products_product_fts_ad",
+    "DROP TRIGGER IF EXISTS products_product_fts_ai",
+    "DROP TABLE IF EXISTS products_product_fts",
+]
+
+
+def _run(schema_editor, statements_by_vendor: dict[str, list[str]]) -> None:
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def forwards(apps, schema_editor):
+    _run(schema_editor, {"postgresql": PG_FORWARD, "sqlite": SQLITE_FORWARD})
+
+
+def backwards(apps, schema_editor):
+    _run(schema_editor, {"postgresql": PG_REVERSE, "sqlite": SQLITE_REVERSE})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
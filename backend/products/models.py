@@ -15,5 +15,24 @@ class Product(models.Model):
     stock = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Public catalog: active products ordered by name, optionally per vendor / by price.
+            models.Index(fields=["is_active", "name", "id"], name="product_active_name_idx"),
+            models.Index(fields=["vendor", "is_active", "name"], name="product_vendor_active_idx"),
+            models.Index(fields=["is_active", "price"], name="product_active_price_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.name
+
+
+class StockReconcileBatch(models.Model):
+    """Marks a batch of Redis reservation deltas as applied to Product.stock.
+
+    Written in the same transaction as the stock UPDATE, so after a crash the
+    reconciler can tell whether a batch it had in flight was committed.
+    """
+
+    token = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class CatalogPagination(PageNumberPagination):
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_pagination_meta(self) -> dict:
+        return {
+            "count": self.page.paginator.count,
+            "page": self.page.number,
+            "page_size": self.get_page_size(self.request),
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        }
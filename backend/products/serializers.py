@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import uuid
+
 from rest_framework import serializers
 
 from .models import Product
@@ -36,6 +38,52 @@ class CatalogProductSerializer(serializers.ModelSerializer):
         )
 
 
+# Fast paths for read-only lists: build the same dicts as ProductSerializer /
+# CatalogProductSerializer from `values_list()` rows, skipping per-field DRF machinery.
+# Decimal formatting reuses DRF's own field so the output contract is identical.
+
+VENDOR_PRODUCT_COLUMNS = ("id", "name", "description", "price", "stock", "is_active")
+CATALOG_PRODUCT_COLUMNS = ("id", "vendor_id", "vendor__shop_name", "name", "description", "price", "stock", "is_active")
+
+_price_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+def vendor_product_rows(rows) -> list[dict]:
+    """ProductSerializer(many=True).data for `values_list(*VENDOR_PRODUCT_COLUMNS)` rows."""
+
+    price = _price_field.to_representation
+    return [
+        {
+            "id": str(product_id),
+            "name": name,
+            "description": description,
+            "price": price(amount),
+            "stock": stock,
+            "is_active": is_active,
+        }
+        for product_id, name, description, amount, stock, is_active in rows
+    ]
+
+
+def catalog_product_rows(rows) -> list[dict]:
+    """CatalogProductSerializer(many=True).data for `values_list(*CATALOG_PRODUCT_COLUMNS)` rows."""
+
+    price = _price_field.to_representation
+    return [
+        {
+            "id": str(product_id),
+            "vendor_id": vendor_id,
+            "vendor_name": vendor_name,
+            "name": name,
+            "description": description,
+            "price": price(amount),
+            "stock": stock,
+            "is_active": is_active,
+        }
+        for product_id, vendor_id, vendor_name, name, description, amount, stock, is_active in rows
+    ]
+
+
 class ProductWriteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
@@ -46,3 +94,57 @@ class ProductWriteSerializer(serializers.ModelSerializer):
             "stock",
             "is_active",
         )
+
+
+class CatalogQuerySerializer(serializers.Serializer):
+    """Query params for GET /api/catalog/products/."""
+
+    vendor_id = serializers.IntegerField(required=False, min_value=1)
+    open_only = serializers.BooleanField(required=False, default=False)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, min_value=0)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, min_value=0)
+
+    def validate(self, attrs):
+        min_price = attrs.get("min_price")
+        max_price = attrs.get("max_price")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise serializers.ValidationError("min_price must be <= max_price")
+        return attrs
+
+
+class CatalogSearchQuerySerializer(CatalogQuerySerializer):
+    """Query params for GET /api/catalog/products/search/."""
+
+    q = serializers.CharField(max_length=100, trim_whitespace=True)
+
+
+class BulkStockSerializer(serializers.Serializer):
+    """Body for POST /api/vendor/products/bulk-stock/."""
+
+    MAX_ITEMS = 5000
+
+    stock = serializers.DictField(child=serializers.IntegerField(min_value=0), allow_empty=False)
+    expected_stock = serializers.DictField(child=serializers.IntegerField(min_value=0), required=False)
+
+    def _normalize_ids(self, value: dict) -> dict:
+        normalized = {}
+        for key, amount in value.items():
+            try:
+                normalized[str(uuid.UUID(str(key)))] = amount
+            except ValueError:
+                raise serializers.ValidationError(f"Invalid product id: {key}")
+        return normalized
+
+    def validate_stock(self, value):
+        if len(value) > self.MAX_ITEMS:
+            raise serializers.ValidationError(f"At most {self.MAX_ITEMS} products per request")
+        return self._normalize_ids(value)
+
+    def validate_expected_stock(self, value):
+        return self._normalize_ids(value)
+
+    def validate(self, attrs):
+        extra = set(attrs.get("expected_stock", {})) - set(attrs["stock"])
+        if extra:
+            raise serializers.ValidationError("expected_stock contains products not in stock")
+        return attrs
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.db_routing import primary_reads
+
+
+# Poll interval for requests waiting on another worker's rebuild.
+WAIT_POLL_SECONDS = 0.025
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "CATALOG_CACHE_TTL_SECONDS", 300))
+
+
+def _lock_seconds() -> int:
+    return int(getattr(settings, "CATALOG_CACHE_LOCK_SECONDS", 5))
+
+
+def _wait_seconds() -> float:
+    return int(getattr(settings, "CATALOG_CACHE_WAIT_MS", 1000)) / 1000
+
+
+def cache_enabled() -> bool:
+    return _ttl_seconds() > 0
+
+
+def _body_key(key: str) -> str:
+    return f"catalog_response:{key}"
+
+
+def _lock_key(key: str) -> str:
+    return f"catalog_response_lock:{key}"
+
+
+async def aget_cached(*, key: str) -> bytes | None:
+    """Cached response bytes for `key` without rendering; None on a miss or when disabled."""
+
+    if not cache_enabled():
+        return None
+    return await cache.aget(_body_key(key))
+
+
+def get_or_render(*, key: str, render: Callable[[], bytes | None]) -> bytes | None:
+    """Return cached response bytes for `key`, rendering them at most once across workers.
+
+    Keys embed the catalog version (see catalog_version_service), so writes invalidate
+    by bumping the version rather than deleting entries. `render` may return None for
+    a response that must not be cached (e.g. an error); it is then passed through.
+
+    Single-flight: the first miss takes a short lock and renders; concurrent misses
+    wait for its result up to CATALOG_CACHE_WAIT_MS before rendering themselves.
+    """
+
+    if not cache_enabled():
+        return render()
+
+    body = cache.get(_body_key(key))
+    if body is not None:
+        return body
+
+    if not cache.add(_lock_key(key), 1, timeout=_lock_seconds()):
+        deadline = time.monotonic() + _wait_seconds()
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_POLL_SECONDS)
+            body = cache.get(_body_key(key))
+            if body is not None:
+                return body
+        return render()
+
+    try:
+        # Shared by every reader until the next version bump: render from the primary.
+        with primary_reads():
+            body = render()
+        if body is not None:
+            cache.set(_body_key(key), body, timeout=_ttl_seconds())
+        return body
+    finally:
+        cache.delete(_lock_key(key))
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+
+GLOBAL_SCOPE = "all"
+
+# Product -> vendor never changes, so the mapping can live long. (User -> vendor is
+# vendors.services.vendor_service.get_vendor_for_user.)
+MAPPING_TTL_SECONDS = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class CatalogVersion:
+    version: int
+    modified_at: float
+
+
+def _version_key(scope: str) -> str:
+    return f"catalog_version:{scope}"
+
+
+def _modified_key(scope: str) -> str:
+    return f"catalog_modified:{scope}"
+
+
+def _scope(vendor_id) -> str:
+    return GLOBAL_SCOPE if vendor_id is None else f"vendor:{vendor_id}"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _seed(scope: str) -> None:
+    # Seed from the clock so a version re-created after eviction never repeats an old ETag.
+    now_ms = _now_ms()
+    cache.add(_version_key(scope), now_ms, timeout=None)
+    cache.add(_modified_key(scope), now_ms / 1000, timeout=None)
+
+
+def get_catalog_version(*, vendor_id=None) -> CatalogVersion:
+    """Current version of one vendor's menu, or of the whole public catalog when vendor_id is None."""
+
+    scope = _scope(vendor_id)
+    keys = [_version_key(scope), _modified_key(scope)]
+    values = cache.get_many(keys)
+    if len(values) != len(keys):
+        _seed(scope)
+        values = cache.get_many(keys)
+
+    return CatalogVersion(
+        version=int(values.get(keys[0], 0)),
+        modified_at=float(values.get(keys[1], 0.0)),
+    )
+
+
+async def aget_catalog_version(*, vendor_id=None) -> CatalogVersion:
+    scope = _scope(vendor_id)
+    keys = [_version_key(scope), _modified_key(scope)]
+    values = await cache.aget_many(keys)
+    if len(values) != len(keys):
+        # Unseeded scope (first request or eviction): let the sync path seed it.
+        return await sync_to_async(get_catalog_version)(vendor_id=vendor_id)
+
+    return CatalogVersion(version=int(values[keys[0]]), modified_at=float(values[keys[1]]))
+
+
+def _bump(scope: str) -> None:
+    try:
+        cache.incr(_version_key(scope))
+    except ValueError:
+        _seed(scope)
+        return
+    cache.set(_modified_key(scope), time.time(), timeout=None)
+
+
+def bump_catalog_version(*, vendor_id, stock_only: bool = False) -> None:
+    """Invalidate a vendor's menu once the current transaction commits.
+
+    The global catalog version is bumped too unless `stock_only`: stock never decides which
+    products an unfiltered page lists or in what order, so those pages pick up stock changes
+    through the vendor versions they are composed from (get_page_catalog_version).
+    """
+
+    def _apply() -> None:
+        _bump(_scope(vendor_id))
+        if not stock_only:
+            _bump(GLOBAL_SCOPE)
+
+    transaction.on_commit(_apply)
+
+
+def bump_catalog_versions(*, vendor_ids, stock_only: bool = False) -> None:
+    for vendor_id in set(vendor_ids):
+        bump_catalog_version(vendor_id=vendor_id, stock_only=stock_only)
+
+
+def _page_vendors_key(*, version: CatalogVersion, page_key: str) -> str:
+    digest = hashlib.sha1(page_key.encode("utf-8")).hexdigest()
+    return f"catalog_page_vendors:{version.version}:{digest}"
+
+
+def get_page_vendor_ids(*, version: CatalogVersion, page_key: str) -> list[int] | None:
+    """Vendors on an unfiltered catalog page at this global version; None until remembered."""
+
+    return cache.get(_page_vendors_key(version=version, page_key=page_key))
+
+
+def remember_page_vendor_ids(*, version: CatalogVersion, page_key: str, vendor_ids) -> None:
+    # Which products a page lists only changes with the global version, which is in the key.
+    cache.set(_page_vendors_key(version=version, page_key=page_key), list(vendor_ids), timeout=MAPPING_TTL_SECONDS)
+
+
+def get_page_catalog_version(*, version: CatalogVersion, vendor_ids) -> tuple[CatalogVersion, tuple]:
+    """Compose an unfiltered page's version from the global one and its vendors' versions.
+
+    Returns the version to validate against plus ETag parts naming each vendor's version, so
+    a stock change invalidates only the pages that show that vendor's products.
+    """
+
+    scopes = [_scope(vendor_id) for vendor_id in vendor_ids]
+    keys = [key for scope in scopes for key in (_version_key(scope), _modified_key(scope))]
+    values = cache.get_many(keys)
+    if len(values) != len(keys):
+        for scope in scopes:
+            _seed(scope)
+        values = cache.get_many(keys)
+
+    parts = []
+    modified_at = version.modified_at
+    for vendor_id, scope in zip(vendor_ids, scopes):
+        parts.append((vendor_id, int(values.get(_version_key(scope), 0))))
+        modified_at = max(modified_at, float(values.get(_modified_key(scope), 0.0)))
+    return CatalogVersion(version=version.version, modified_at=modified_at), tuple(parts)
+
+
+def catalog_etag(*parts: object) -> str:
+    """Strong ETag from a version plus whatever else shapes the response (path, query)."""
+
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def get_product_vendor_id(*, product_id) -> str | None:
+    return cache.get(f"catalog_product_vendor:{product_id}")
+
+
+async def aget_product_vendor_id(*, product_id) -> str | None:
+    return await cache.aget(f"catalog_product_vendor:{product_id}")
+
+
+def remember_product_vendor_id(*, product_id, vendor_id) -> None:
+    cache.set(f"catalog_product_vendor:{product_id}", str(vendor_id), timeout=MAPPING_TTL_SECONDS)
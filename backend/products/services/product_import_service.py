@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.db import transaction
+
+from products.models import Product
+from products.services import stock_reservation_service
+from products.services.catalog_version_service import bump_catalog_version
+from vendors.services.vendor_service import get_vendor_for_user
+
+
+MAX_IMPORT_ROWS = 5000
+IMPORT_CHUNK_SIZE = 500
+
+WRITABLE_FIELDS = ("name", "description", "price", "stock", "is_active")
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, message: str) -> None:
+        self.errors.append({"row": row, "error": message})
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield CSV rows as dicts without reading the whole upload into memory.
+
+    Blank cells are treated as "not provided", so update rows keep the current value
+    (use the JSON format to clear a description).
+    """
+
+    for raw in csv.DictReader(lines):
+        row: dict[str, Any] = {}
+        for key, value in raw.items():
+            if key is None:
+                continue
+            key = key.strip().lower()
+            value = (value or "").strip()
+            if value:
+                row[key] = value
+        yield row
+
+
+@dataclass(frozen=True)
+class ImportRow:
+    """One validated (or rejected) input row; `number` is 1-based."""
+
+    number: int
+    product_id: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+
+def _apply_chunk(*, vendor, chunk: list[ImportRow], result: ImportResult) -> None:
+    ids = {row.product_id for row in chunk if row.error is None and row.product_id}
+    existing = {str(p.pk): p for p in Product.objects.filter(vendor=vendor, pk__in=ids)} if ids else {}
+
+    to_create: list[Product] = []
+    to_update: dict[str, Product] = {}
+    changed_fields: dict[str, set[str]] = {}
+
+    for row in chunk:
+        if row.error is not None:
+            result.add_error(row.number, row.error)
+            continue
+
+        if row.product_id is None:
+            to_create.append(Product(vendor=vendor, **row.data))
+            continue
+
+        product = existing.get(row.product_id)
+        if product is None:
+            result.add_error(row.number, "Product not found")
+            continue
+
+        fields = changed_fields.setdefault(row.product_id, set())
+        for key, value in row.data.items():
+            if key in WRITABLE_FIELDS:
+                setattr(product, key, value)
+                fields.add(key)
+        to_update[row.product_id] = product
+
+    # bulk_update writes every listed field of every object, so products are grouped by
+    # the fields their rows set; otherwise a stale `stock` would overwrite order decrements.
+    groups: dict[tuple[str, ...], list[Product]] = {}
+    for product_id, fields in changed_fields.items():
+        if fields:
+            groups.setdefault(tuple(sorted(fields)), []).append(to_update[product_id])
+
+    if to_create:
+        Product.objects.bulk_create(to_create)
+    for fields, products in groups.items():
+        Product.objects.bulk_update(products, fields=list(fields))
+
+    stock_reservation_service.reset_on_commit(
+        stock={pid: to_update[pid].stock for pid, fields in changed_fields.items() if "stock" in fields}
+    )
+
+    result.created += len(to_create)
+    result.updated += sum(len(products) for products in groups.values())
+
+
+def import_vendor_products(
+    *, user, rows: Iterable[ImportRow], chunk_size: int = IMPORT_CHUNK_SIZE
+) -> ImportResult:
+    """Create/update a vendor's products from validated rows.
+
+    Rows with a `product_id` update that product (only the given fields); rows without
+    one create a product; rejected rows are skipped and reported by number. The whole
+    input is read first, so a decoding or CSV error raises before anything is written.
+    All rows are then applied in one transaction (in chunks of bulk_create/bulk_update).
+    """
+
+    vendor = get_vendor_for_user(user=user)
+    result = ImportResult()
+    accepted: list[ImportRow] = []
+    overflow_row: int | None = None
+
+    for row in rows:
+        if row.number > MAX_IMPORT_ROWS:
+            overflow_row = row.number
+            break
+        accepted.append(row)
+
+    with transaction.atomic():
+        for start in range(0, len(accepted), chunk_size):
+            _apply_chunk(vendor=vendor, chunk=accepted[start : start + chunk_size], result=result)
+        if result.created or result.updated:
+            bump_catalog_version(vendor_id=vendor.id)
+
+    if overflow_row is not None:
+        result.add_error(overflow_row, f"Too many rows (max {MAX_IMPORT_ROWS}); remaining rows ignored")
+
+    return result
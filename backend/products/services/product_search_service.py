@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+
+MAX_SEARCH_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> list[str]:
+    """Split free text into lowercase word terms (punctuation/operators dropped)."""
+
+    return [t.lower() for t in _TERM_RE.findall(query or "")][:MAX_SEARCH_TERMS]
+
+
+def _postgres_search(qs: QuerySet, terms: list[str]) -> QuerySet:
+    # Every term must match; the last one as a prefix for typeahead.
+    tsquery = " & ".join([*terms[:-1], f"{terms[-1]}:*"])
+    return (
+        qs.alias(
+            fts_match=RawSQL(
+                "products_product.search_vector @@ to_tsquery('simple', %s)",
+                [tsquery],
+                output_field=BooleanField(),
+            )
+        )
+        .filter(fts_match=True)
+        .annotate(
+            search_rank=RawSQL(
+                "ts_rank(products_product.search_vector, to_tsquery('simple', %s))",
+                [tsquery],
+                output_field=FloatField(),
+            )
+        )
+        .order_by("-search_rank", "name", "id")
+    )
+
+
+def _sqlite_search(qs: QuerySet, terms: list[str]) -> QuerySet:
+    match = " ".join([*(f'"{t}"' for t in terms[:-1]), f'"{terms[-1]}"*'])
+    return (
+        qs.filter(
+            pk__in=RawSQL(
+                "SELECT product_id FROM products_product_fts WHERE products_product_fts MATCH %s",
+                [match],
+            )
+        )
+        .annotate(
+            # bm25() is lower-is-better; negate so ordering matches Postgres.
+            search_rank=RawSQL(
+                "SELECT -bm25(products_product_fts) FROM products_product_fts "
+                "WHERE products_product_fts MATCH %s AND product_id = products_product.id",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+        .order_by("-search_rank", "name", "id")
+    )
+
+
+def _fallback_search(qs: QuerySet, terms: list[str]) -> QuerySet:
+    cond = Q()
+    for term in terms:
+        cond &= Q(name__icontains=term) | Q(description__icontains=term)
+    return qs.filter(cond).order_by("name", "id")
+
+
+def search_products(qs: QuerySet, *, query: str) -> QuerySet:
+    """Apply ranked full-text search to a Product queryset.
+
+    PostgreSQL uses the stored `search_vector` column (GIN index), SQLite uses the
+    FTS5 table; both created by products migration 0003.
+    """
+
+    terms = search_terms(query)
+    if not terms:
+        return qs.none()
+
+    if connection.vendor == "postgresql":
+        return _postgres_search(qs, terms)
+    if connection.vendor == "sqlite":
+        return _sqlite_search(qs, terms)
+    return _fallback_search(qs, terms)
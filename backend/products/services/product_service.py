@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+from decimal import Decimal
+
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 
+from config.db_routing import replica_read
 from products.models import Product
+from products.services import stock_reservation_service
+from products.services.catalog_version_service import bump_catalog_version
+from products.services.product_search_service import search_products
 from vendors.models import Vendor
 from vendors.services.vendor_service import get_vendor_for_user
 
@@ -19,7 +26,9 @@ def get_vendor_product(*, user, product_id) -> Product:
 
 def create_vendor_product(*, user, **fields) -> Product:
     vendor: Vendor = get_vendor_for_user(user=user)
-    return Product.objects.create(vendor=vendor, **fields)
+    product = Product.objects.create(vendor=vendor, **fields)
+    bump_catalog_version(vendor_id=vendor.id)
+    return product
 
 
 def update_vendor_product(*, user, product_id, **fields) -> Product:
@@ -35,19 +44,61 @@ def update_vendor_product(*, user, product_id, **fields) -> Product:
         update_fields.append(key)
 
     if update_fields:
-        product.save(update_fields=update_fields)
+        with transaction.atomic():
+            product.save(update_fields=update_fields)
+            bump_catalog_version(vendor_id=product.vendor_id, stock_only=update_fields == ["stock"])
+            if "stock" in update_fields:
+                stock_reservation_service.reset_on_commit(stock={str(product.id): product.stock})
 
     return product
 
 
 def delete_vendor_product(*, user, product_id) -> None:
     product = get_vendor_product(user=user, product_id=product_id)
+    vendor_id = product.vendor_id
     product.delete()
+    bump_catalog_version(vendor_id=vendor_id)
+
+
+CATALOG_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "stock",
+    "is_active",
+    "vendor__id",
+    "vendor__shop_name",
+)
+
+
+@replica_read
+def list_public_products(
+    *,
+    vendor_id: int | None = None,
+    open_only: bool = False,
+    min_price: Decimal | None = None,
+    max_price: Decimal | None = None,
+):
+    qs = Product.objects.filter(is_active=True)
+    if vendor_id is not None:
+        qs = qs.filter(vendor_id=vendor_id)
+    if open_only:
+        qs = qs.filter(vendor__is_open=True)
+    if min_price is not None:
+        qs = qs.filter(price__gte=min_price)
+    if max_price is not None:
+        qs = qs.filter(price__lte=max_price)
+    return qs.select_related("vendor").only(*CATALOG_FIELDS).order_by("name", "id")
+
+
+def search_public_products(*, query: str, **filters):
+    return search_products(list_public_products(**filters), query=query)
 
 
-def list_public_products():
-    return Product.objects.filter(is_active=True).order_by("name")
+def get_public_product(*, product_id) -> Product:
+    return Product.objects.select_related("vendor").only(*CATALOG_FIELDS).get(pk=product_id, is_active=True)
 
 
-def get_public_product(*, product_id) -> Product:
-    return Product.objects.get(pk=product_id, is_active=True)
+def get_public_product_vendor_id(*, product_id) -> int:
+    return Product.objects.filter(is_active=True).values_list("vendor_id", flat=True).get(pk=product_id)
@@ -0,0 +1,475 @@
+"""Optional Redis stock reservation layer for hot products.
+
+When STOCK_RESERVATIONS_ENABLED is set (and REDIS_URL is configured), available
+stock is mirrored in Redis counters and orders reserve stock with one atomic Lua
+script instead of contending on Postgres product rows:
+
+- `reserve()` checks and decrements every counter of an order atomically and
+  records the reservation with a deadline (TTL).
+- `confirm()` runs after the order transaction commits and moves the reserved
+  quantities into a pending-reconciliation hash.
+- `release()` returns reserved stock if the transaction fails; expired
+  reservations are released by `sweep_expired()`.
+- `reconcile()` applies pending quantities to `Product.stock` in batches (see the
+  `reconcile_stock_reservations` management command). Each batch commits a
+  `StockReconcileBatch` token with the stock UPDATE, so a batch interrupted between
+  the DB commit and settling Redis is settled, not applied again, on the next run.
+
+An absolute stock change (`reset()`) replaces the counter and drops pending quantities.
+Each counter has an epoch that `reset()` bumps. Reservations remember the epoch they
+were made in, and `release()`/`confirm()` ignore reservations from an older epoch, so
+they cannot move a counter that no longer includes them. Services schedule resets with
+`reset_on_commit()`, so Redis never holds a value the DB did not commit.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from products.models import Product, StockReconcileBatch
+from products.services.catalog_version_service import bump_catalog_versions
+
+
+logger = logging.getLogger(__name__)
+
+
+STOCK_KEY_PREFIX = "stock:"
+RESERVATION_KEY_PREFIX = "stock_res:"
+DEADLINES_KEY = "stock_res_deadlines"
+PENDING_KEY = "stock_pending"
+EPOCH_KEY_PREFIX = "stock_epoch:"
+RESETTING_KEY_PREFIX = "stock_resetting:"
+IN_FLIGHT_KEY = "stock_reconcile_in_flight"
+RECONCILE_LOCK_KEY = "stock_reconcile_lock"
+
+# Guard lifetime when the transaction that scheduled a reset rolls back instead.
+RESET_GUARD_SECONDS = 60
+
+# One reconciler at a time; the lock expires if its holder dies.
+RECONCILE_LOCK_SECONDS = 300
+
+# Committed batch tokens are only read back by the next run; keep a day for safety.
+RECONCILE_TOKEN_RETENTION = timedelta(days=1)
+
+
+# Reservation hash values are "<qty>:<epoch>" (the counter epoch at reserve time); a bare
+# "<qty>" (reserved before epochs existed) counts as epoch 0.
+_RESERVE_LUA = """
+local n = (#KEYS - 2) / 2
+for i = 1, n do
+  local v = redis.call('GET', KEYS[i + 2])
+  if not v then return {-1, i} end
+  if tonumber(v) < tonumber(ARGV[2 + 2 * i]) then return {0, i} end
+end
+for i = 1, n do
+  local epoch = redis.call('GET', KEYS[n + i + 2]) or '0'
+  redis.call('DECRBY', KEYS[i + 2], ARGV[2 + 2 * i])
+  redis.call('HSET', KEYS[1], ARGV[1 + 2 * i], ARGV[2 + 2 * i] .. ':' .. epoch)
+end
+redis.call('ZADD', KEYS[2], ARGV[1], ARGV[2])
+return {1, 0}
+"""
+
+# ARGV: reservation id, stock key prefix, epoch key prefix. Returns items voided by a reset.
+_RELEASE_LUA = """
+local items = redis.call('HGETALL', KEYS[1])
+local voided = 0
+for i = 1, #items, 2 do
+  local qty, epoch = string.match(items[i + 1], '^(%d+):(%d+)$')
+  if not qty then qty, epoch = items[i + 1], '0' end
+  local key = ARGV[2] .. items[i]
+  if epoch == (redis.call('GET', ARGV[3] .. items[i]) or '0') and redis.call('EXISTS', key) == 1 then
+    redis.call('INCRBY', key, qty)
+  else
+    voided = voided + 1
+  end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return voided
+"""
+
+# ARGV: reservation id, epoch key prefix. Returns {items, items voided by a reset}.
+_CONFIRM_LUA = """
+local items = redis.call('HGETALL', KEYS[1])
+local voided = 0
+for i = 1, #items, 2 do
+  local qty, epoch = string.match(items[i + 1], '^(%d+):(%d+)$')
+  if not qty then qty, epoch = items[i + 1], '0' end
+  if epoch == (redis.call('GET', ARGV[2] .. items[i]) or '0') then
+    redis.call('HINCRBY', KEYS[3], items[i], qty)
+  else
+    voided = voided + 1
+  end
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return {#items / 2, voided}
+"""
+
+# ARGV: prefix, then (product_id, delta) pairs. Adds delta to the counter (if
+# mirrored) and subtracts it from the pending hash so reconcile applies it to the DB.
+_ADJUST_LUA = """
+for i = 2, #ARGV, 2 do
+  local key = ARGV[1] .. ARGV[i]
+  if redis.call('EXISTS', key) == 1 then
+    redis.call('INCRBY', key, ARGV[i + 1])
+  end
+  redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1]))
+end
+return 1
+"""
+
+_SEED_LUA = """
+local pending = tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or '0')
+return redis.call('SET', KEYS[1], tonumber(ARGV[2]) - pending, 'NX')
+"""
+
+_RESET_LUA = """
+redis.call('INCR', KEYS[3])
+redis.call('DEL', KEYS[4])
+redis.call('HDEL', KEYS[2], ARGV[1])
+return redis.call('SET', KEYS[1], ARGV[2])
+"""
+
+# ARGV: epoch key prefix. Returns (product_id, pending_qty, epoch) triples, read atomically.
+_SNAPSHOT_LUA = """
+local pending = redis.call('HGETALL', KEYS[1])
+local out = {}
+for i = 1, #pending, 2 do
+  table.insert(out, pending[i])
+  table.insert(out, pending[i + 1])
+  table.insert(out, redis.call('GET', ARGV[1] .. pending[i]) or '0')
+end
+return out
+"""
+
+# KEYS: pending hash, in-flight hash. ARGV: epoch key prefix, batch token, then
+# (product_id, applied_qty, epoch) triples. Entries whose epoch moved were dropped by
+# reset(), so they are left alone instead of going negative. Clears the in-flight batch.
+_SETTLE_LUA = """
+for i = 3, #ARGV, 3 do
+  if (redis.call('GET', ARGV[1] .. ARGV[i]) or '0') == ARGV[i + 2] then
+    local left = redis.call('HINCRBY', KEYS[1], ARGV[i], -tonumber(ARGV[i + 1]))
+    if left == 0 then redis.call('HDEL', KEYS[1], ARGV[i]) end
+  end
+end
+redis.call('HDEL', KEYS[2], ARGV[2])
+return 1
+"""
+
+
+class _Scripts:
+    def __init__(self, client):
+        self.reserve = client.register_script(_RESERVE_LUA)
+        self.release = client.register_script(_RELEASE_LUA)
+        self.confirm = client.register_script(_CONFIRM_LUA)
+        self.adjust = client.register_script(_ADJUST_LUA)
+        self.seed = client.register_script(_SEED_LUA)
+        self.reset = client.register_script(_RESET_LUA)
+        self.snapshot = client.register_script(_SNAPSHOT_LUA)
+        self.settle = client.register_script(_SETTLE_LUA)
+
+
+_client = None
+_scripts: _Scripts | None = None
+
+
+def reservations_enabled() -> bool:
+    return bool(getattr(settings, "STOCK_RESERVATIONS_ENABLED", False) and getattr(settings, "REDIS_URL", ""))
+
+
+def _redis() -> tuple[object, _Scripts]:
+    global _client, _scripts
+    if _client is None or _scripts is None:
+        import redis  # type: ignore
+
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+        _scripts = _Scripts(_client)
+    return _client, _scripts
+
+
+def _stock_key(product_id: str) -> str:
+    return f"{STOCK_KEY_PREFIX}{product_id}"
+
+
+def _reservation_key(reservation_id: str) -> str:
+    return f"{RESERVATION_KEY_PREFIX}{reservation_id}"
+
+
+def _epoch_key(product_id: str) -> str:
+    return f"{EPOCH_KEY_PREFIX}{product_id}"
+
+
+def _resetting_key(product_id: str) -> str:
+    return f"{RESETTING_KEY_PREFIX}{product_id}"
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "STOCK_RESERVATION_TTL_SECONDS", 120))
+
+
+def seed(*, product_id: str, db_stock: int) -> None:
+    """Mirror DB stock into Redis unless a counter already exists."""
+
+    _, scripts = _redis()
+    scripts.seed(keys=[_stock_key(product_id), PENDING_KEY], args=[product_id, int(db_stock)])
+
+
+def reset(*, product_id: str, stock: int) -> None:
+    """Overwrite the mirrored counter after an absolute stock change in the DB.
+
+    Starts a new epoch: in-flight reservations no longer move the counter or the DB.
+    """
+
+    if not reservations_enabled():
+        return
+    _, scripts = _redis()
+    scripts.reset(
+        keys=[_stock_key(product_id), PENDING_KEY, _epoch_key(product_id), _resetting_key(product_id)],
+        args=[product_id, int(stock)],
+    )
+
+
+def reset_on_commit(*, stock: dict[str, int]) -> None:
+    """`reset()` each product once the surrounding transaction commits.
+
+    Call inside the transaction that writes the absolute values. Until the reset runs,
+    `reconcile()` leaves these products alone, so pending quantities are not applied on
+    top of the new values; after a rollback the guard simply expires.
+    """
+
+    if not reservations_enabled() or not stock:
+        return
+    client, _ = _redis()
+    pipe = client.pipeline()
+    for product_id in stock:
+        pipe.set(_resetting_key(product_id), 1, ex=RESET_GUARD_SECONDS)
+    pipe.execute()
+
+    def _reset() -> None:
+        for product_id, value in stock.items():
+            reset(product_id=product_id, stock=value)
+
+    transaction.on_commit(_reset)
+
+
+def reserve(*, reservation_id: str, quantities: dict[str, int], db_stock: dict[str, int]) -> None:
+    """Atomically reserve every quantity or none. Raises ValueError when short.
+
+    `db_stock` seeds counters that are not mirrored yet.
+    """
+
+    _, scripts = _redis()
+    product_ids = list(quantities)
+    keys = [
+        _reservation_key(reservation_id),
+        DEADLINES_KEY,
+        *[_stock_key(pid) for pid in product_ids],
+        *[_epoch_key(pid) for pid in product_ids],
+    ]
+    args: list[object] = [time.time() + _ttl_seconds(), reservation_id]
+    for pid in product_ids:
+        args.extend([pid, quantities[pid]])
+
+    for _attempt in range(2):
+        status, index = scripts.reserve(keys=keys, args=args)
+        if status == 1:
+            return
+        if status == 0:
+            raise ValueError(f"Insufficient stock for product {product_ids[index - 1]}")
+        seed(product_id=product_ids[index - 1], db_stock=db_stock.get(product_ids[index - 1], 0))
+
+    raise ValueError("Stock is temporarily unavailable")
+
+
+def release(*, reservation_id: str) -> None:
+    """Return an unconfirmed reservation to the counters (idempotent)."""
+
+    _, scripts = _redis()
+    scripts.release(
+        keys=[_reservation_key(reservation_id), DEADLINES_KEY],
+        args=[reservation_id, STOCK_KEY_PREFIX, EPOCH_KEY_PREFIX],
+    )
+
+
+def confirm(*, reservation_id: str, quantities: dict[str, int]) -> None:
+    """Mark a reservation as committed so reconcile applies it to Product.stock."""
+
+    _, scripts = _redis()
+    confirmed, voided = scripts.confirm(
+        keys=[_reservation_key(reservation_id), DEADLINES_KEY, PENDING_KEY],
+        args=[reservation_id, EPOCH_KEY_PREFIX],
+    )
+    if voided:
+        # An absolute stock update replaced the counter after this order reserved; that
+        # value is authoritative, so the reserved quantity is not applied on top of it.
+        logger.info(
+            "stock_reservation_superseded",
+            extra={"event": "stock_reservation_superseded", "order_id": reservation_id},
+        )
+    if not confirmed:
+        # Reservation expired and was swept before the order committed: take the
+        # stock again so counters and the DB stay in step.
+        logger.warning(
+            "stock_reservation_expired",
+            extra={"event": "stock_reservation_expired", "order_id": reservation_id},
+        )
+        adjust(quantities={pid: -qty for pid, qty in quantities.items()})
+
+
+def adjust(*, quantities: dict[str, int]) -> None:
+    """Add signed deltas to counters and queue the same change for the DB."""
+
+    if not quantities:
+        return
+    _, scripts = _redis()
+    args: list[object] = [STOCK_KEY_PREFIX]
+    for pid, delta in quantities.items():
+        args.extend([pid, delta])
+    scripts.adjust(keys=[PENDING_KEY], args=args)
+
+
+def sweep_expired(*, now: float | None = None) -> int:
+    """Release reservations whose deadline has passed. Returns how many were released."""
+
+    client, _ = _redis()
+    expired = client.zrangebyscore(DEADLINES_KEY, "-inf", now or time.time())
+    for raw in expired:
+        release(reservation_id=_text(raw))
+    return len(expired)
+
+
+def _settle(scripts: _Scripts, *, token: str, batch: list) -> None:
+    args: list[object] = [EPOCH_KEY_PREFIX, token]
+    for pid, qty, epoch in batch:
+        args.extend([pid, qty, epoch])
+    scripts.settle(keys=[PENDING_KEY, IN_FLIGHT_KEY], args=args)
+
+
+def _recover_in_flight(client, scripts: _Scripts) -> None:
+    """Finish batches a previous run left between its DB transaction and settling Redis."""
+
+    in_flight = {_text(token): json.loads(batch) for token, batch in client.hgetall(IN_FLIGHT_KEY).items()}
+    if not in_flight:
+        return
+
+    committed = {
+        str(token)
+        for token in StockReconcileBatch.objects.filter(pk__in=list(in_flight)).values_list("pk", flat=True)
+    }
+    for token, batch in in_flight.items():
+        if token in committed:
+            _settle(scripts, token=token, batch=batch)
+        else:
+            # Rolled back (or never started): the quantities are still pending.
+            client.hdel(IN_FLIGHT_KEY, token)
+        logger.warning(
+            "stock_reconcile_recovered",
+            extra={"event": "stock_reconcile_recovered", "batch": token, "committed": token in committed},
+        )
+
+
+def _apply_batch(client, batch: list[tuple[str, int, str]], *, token: str) -> list[tuple[str, int, str]]:
+    """Apply one batch to Product.stock in a transaction; returns the entries applied."""
+
+    with transaction.atomic():
+        rows = {
+            str(pk): (stock, vendor_id)
+            for pk, stock, vendor_id in Product.objects.select_for_update()
+            .filter(pk__in=[pid for pid, _, _ in batch])
+            .order_by("pk")
+            .values_list("pk", "stock", "vendor_id")
+        }
+        flags = client.mget([_epoch_key(pid) for pid, _, _ in batch] + [_resetting_key(pid) for pid, _, _ in batch])
+        epochs, resetting = flags[: len(batch)], flags[len(batch) :]
+        batch = [
+            item
+            for item, epoch, guard in zip(batch, epochs, resetting)
+            if guard is None and _text(epoch or b"0") == item[2]
+        ]
+        if not batch:
+            return batch
+
+        # Before the commit: a crash after it leaves a record that recovery can settle.
+        client.hset(IN_FLIGHT_KEY, token, json.dumps(batch))
+        # Deleted products have no row; their entries are only settled.
+        whens = []
+        for pid, qty, _ in batch:
+            if pid not in rows:
+                continue
+            stock = rows[pid][0]
+            if stock < qty:
+                # Should not happen while counters and the DB agree; surface it.
+                logger.warning(
+                    "stock_reconcile_clamped",
+                    extra={"event": "stock_reconcile_clamped", "product_id": pid, "stock": stock, "quantity": qty},
+                )
+            whens.append(When(pk=pid, then=F("stock") - qty))
+        if whens:
+            Product.objects.filter(pk__in=[pid for pid, _, _ in batch if pid in rows]).update(
+                stock=Greatest(Case(*whens, default=F("stock"), output_field=IntegerField()), Value(0))
+            )
+        StockReconcileBatch.objects.create(token=token)
+        bump_catalog_versions(vendor_ids=[rows[pid][1] for pid, _, _ in batch if pid in rows], stock_only=True)
+    return batch
+
+
+def reconcile(*, batch_size: int = 500) -> int:
+    """Apply pending reservation quantities to Product.stock. Returns products updated.
+
+    Pending entries are read together with their epoch. Each batch locks its product
+    rows and skips products whose epoch moved since (a reset dropped those quantities)
+    or that have a reset scheduled (`reset_on_commit()`). Settling is conditional on
+    the epoch too, so a concurrent reset never drives a pending entry negative.
+
+    Inside its transaction a batch is recorded as in flight in Redis, then committed
+    with a StockReconcileBatch token and a single stock UPDATE; settling clears the
+    record. If the process dies in between, the next run settles the batch when its
+    token committed and drops it otherwise, so no delta is applied twice.
+    """
+
+    client, scripts = _redis()
+    lock = str(uuid.uuid4())
+    if not client.set(RECONCILE_LOCK_KEY, lock, nx=True, ex=RECONCILE_LOCK_SECONDS):
+        return 0
+
+    try:
+        _recover_in_flight(client, scripts)
+
+        raw = scripts.snapshot(keys=[PENDING_KEY], args=[EPOCH_KEY_PREFIX])
+        items: list[tuple[str, int, str]] = []
+        for i in range(0, len(raw), 3):
+            qty = int(raw[i + 1])
+            if qty:
+                items.append((_text(raw[i]), qty, _text(raw[i + 2])))
+        if not items:
+            return 0
+
+        StockReconcileBatch.objects.filter(created_at__lt=timezone.now() - RECONCILE_TOKEN_RETENTION).delete()
+
+        applied = 0
+        for start in range(0, len(items), batch_size):
+            token = str(uuid.uuid4())
+            batch = _apply_batch(client, items[start : start + batch_size], token=token)
+            if batch:
+                _settle(scripts, token=token, batch=batch)
+            applied += len(batch)
+        return applied
+    finally:
+        if _text(client.get(RECONCILE_LOCK_KEY) or b"") == lock:
+            client.delete(RECONCILE_LOCK_KEY)
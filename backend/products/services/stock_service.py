@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, When
+
+from products.models import Product
+from products.services import stock_reservation_service
+from products.services.catalog_version_service import bump_catalog_version, bump_catalog_versions
+from vendors.models import Vendor
+
+
+def aggregate_quantities(pairs: Iterable[tuple[object, int]]) -> dict[str, int]:
+    """Merge (product_id, quantity) pairs into {product_id: total_quantity}."""
+
+    quantities: dict[str, int] = {}
+    for product_id, quantity in pairs:
+        quantities[str(product_id)] = quantities.get(str(product_id), 0) + int(quantity)
+    return quantities
+
+
+def decrement_stock(*, vendor: Vendor, quantities: dict[str, int]) -> None:
+    """Decrement stock for all products in one guarded UPDATE.
+
+    Rows whose stock is below the requested quantity are excluded by the WHERE
+    clause; if fewer rows than requested are updated, the caller's transaction
+    is rolled back via ValueError.
+    """
+
+    guard = Q()
+    whens = []
+    for product_id, quantity in quantities.items():
+        guard |= Q(pk=product_id, stock__gte=quantity)
+        whens.append(When(pk=product_id, then=F("stock") - quantity))
+
+    updated = Product.objects.filter(guard, vendor=vendor, is_active=True).update(
+        stock=Case(*whens, default=F("stock"), output_field=IntegerField())
+    )
+    if updated != len(quantities):
+        raise ValueError("Insufficient stock for one or more products")
+
+    bump_catalog_version(vendor_id=vendor.id, stock_only=True)
+
+
+def restock(*, quantities: dict[str, int]) -> None:
+    """Return stock for all products in one UPDATE (e.g. cancelled orders)."""
+
+    if not quantities:
+        return
+
+    whens = [When(pk=product_id, then=F("stock") + quantity) for product_id, quantity in quantities.items()]
+    qs = Product.objects.filter(pk__in=list(quantities))
+    qs.update(stock=Case(*whens, default=F("stock"), output_field=IntegerField()))
+    bump_catalog_versions(vendor_ids=qs.values_list("vendor_id", flat=True).distinct(), stock_only=True)
+
+
+def return_order_stock(*, order) -> None:
+    """Give a cancelled/rejected order's quantities back to available stock.
+
+    With the Redis reservation layer enabled the counters are bumped after commit
+    and the DB catches up via reconciliation; otherwise the DB is updated directly.
+    """
+
+    quantities = aggregate_quantities(order.items.values_list("product_id", "quantity"))
+    if stock_reservation_service.reservations_enabled():
+        transaction.on_commit(lambda: stock_reservation_service.adjust(quantities=quantities))
+    else:
+        restock(quantities=quantities)
+
+
+@dataclass
+class BulkStockResult:
+    updated: list[str] = field(default_factory=list)
+    conflicts: list[dict[str, object]] = field(default_factory=list)
+    not_found: list[str] = field(default_factory=list)
+
+
+@transaction.atomic
+def set_vendor_stock(
+    *,
+    vendor: Vendor,
+    stock: dict[str, int],
+    expected: dict[str, int] | None = None,
+) -> BulkStockResult:
+    """Set absolute stock levels for many of a vendor's products in one UPDATE.
+
+    `expected` enables per-product compare-and-set: a product is only updated when its
+    current stock equals the expected value, otherwise it is reported as a conflict
+    (with its current stock) and the rest of the batch is still applied.
+    """
+
+    expected = expected or {}
+    result = BulkStockResult()
+
+    current_qs = Product.objects.filter(vendor=vendor, pk__in=list(stock)).values_list("pk", "stock")
+    if expected:
+        # Lock the rows so the comparison and the UPDATE see the same values.
+        current_qs = current_qs.select_for_update()
+    current = {str(pk): value for pk, value in current_qs}
+
+    to_apply: dict[str, int] = {}
+    for product_id, new_stock in stock.items():
+        if product_id not in current:
+            result.not_found.append(product_id)
+        elif product_id in expected and current[product_id] != expected[product_id]:
+            result.conflicts.append({"id": product_id, "stock": current[product_id]})
+        else:
+            to_apply[product_id] = new_stock
+
+    if to_apply:
+        whens = [When(pk=product_id, then=value) for product_id, value in to_apply.items()]
+        Product.objects.filter(vendor=vendor, pk__in=list(to_apply)).update(
+            stock=Case(*whens, default=F("stock"), output_field=IntegerField())
+        )
+        stock_reservation_service.reset_on_commit(stock=to_apply)
+        bump_catalog_version(vendor_id=vendor.id, stock_only=True)
+        result.updated = list(to_apply)
+
+    return result
@@ -1,10 +1,12 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import CatalogProductViewSet, VendorProductViewSet
+from config.async_views import with_fast_paths
+
+from .views import CatalogProductViewSet, VendorProductViewSet, catalog_product_detail_fast
 
 router = DefaultRouter()
 router.register(r"products", VendorProductViewSet, basename="products")
 router.register(r"vendor/products", VendorProductViewSet, basename="vendor-products")
 router.register(r"catalog/products", CatalogProductViewSet, basename="catalog-products")
 
-urlpatterns = router.urls
+urlpatterns = with_fast_paths(router.urls, {"catalog-products-detail": catalog_product_detail_fast})
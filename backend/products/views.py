@@ -1,22 +1,63 @@
 from __future__ import annotations
 
+import codecs
+import csv
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from config.async_views import Fallback, fast_path, not_modified_response, rendered_json_response
+from config.jsonlib import FastJSONRenderer
 from vendors.permissions import IsVendor
+from vendors.services.vendor_service import get_vendor_for_user
 
-from .serializers import CatalogProductSerializer, ProductSerializer, ProductWriteSerializer
+from .pagination import CatalogPagination
+from .serializers import (
+    CATALOG_PRODUCT_COLUMNS,
+    VENDOR_PRODUCT_COLUMNS,
+    BulkStockSerializer,
+    CatalogProductSerializer,
+    CatalogQuerySerializer,
+    CatalogSearchQuerySerializer,
+    ProductSerializer,
+    ProductWriteSerializer,
+    catalog_product_rows,
+    vendor_product_rows,
+)
+from .services.catalog_cache_service import aget_cached, get_or_render
+from .services.catalog_version_service import (
+    CatalogVersion,
+    aget_catalog_version,
+    aget_product_vendor_id,
+    catalog_etag,
+    get_catalog_version,
+    get_page_catalog_version,
+    get_page_vendor_ids,
+    get_product_vendor_id,
+    remember_page_vendor_ids,
+    remember_product_vendor_id,
+)
+from .services.product_import_service import ImportRow, import_vendor_products, iter_csv_rows
 from .services.product_service import (
     create_vendor_product,
     delete_vendor_product,
     get_public_product,
+    get_public_product_vendor_id,
     get_vendor_product,
     list_public_products,
     list_vendor_products,
+    search_public_products,
     update_vendor_product,
 )
+from .services.stock_service import set_vendor_stock
 
 
 def _success(data, *, http_status: int = status.HTTP_200_OK) -> Response:
@@ -37,15 +78,148 @@ def _error(message: str, *, http_status: int) -> Response:
     return Response({"success": False, "error": message}, status=http_status)
 
 
+def _is_not_modified(request, *, etag: str, last_modified: int) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 requires for If-None-Match.
+        candidates = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def _conditional(
+    request,
+    *,
+    version: CatalogVersion,
+    etag_parts: tuple,
+    build: Callable[[], Response],
+    cache_control: str = "no-cache",
+    shared_cache: bool = False,
+) -> HttpResponse:
+    """Answer 304 from the catalog version alone, otherwise build the body and attach validators.
+
+    The version is read before `build()` queries the DB, so a concurrent write can only
+    make the ETag older than the body (forcing a refetch), never newer. With
+    `shared_cache`, the rendered 200 body is also cached server-side under the ETag.
+    """
+
+    etag = catalog_etag(version.version, *etag_parts)
+    last_modified = int(version.modified_at)
+
+    if _is_not_modified(request, etag=etag, last_modified=last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    elif shared_cache and request.accepted_renderer.format == "json":
+        response = _cached_json(key=etag.strip('"'), build=build)
+    else:
+        response = build()
+
+    if response.status_code not in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        return response
+    return _with_validators(response, etag=etag, last_modified=last_modified, cache_control=cache_control)
+
+
+def _with_validators(response: HttpResponse, *, etag: str, last_modified: int, cache_control: str) -> HttpResponse:
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def _cached_json(*, key: str, build: Callable[[], Response]) -> HttpResponse:
+    """Serve pre-rendered JSON bytes; only successful bodies are cached."""
+
+    uncached: list[Response] = []
+
+    def _render() -> bytes | None:
+        response = build()
+        if response.status_code != status.HTTP_200_OK:
+            uncached.append(response)
+            return None
+        return FastJSONRenderer().render(response.data)
+
+    body = get_or_render(key=key, render=_render)
+    if body is None:
+        return uncached[0]
+    return HttpResponse(body, content_type="application/json")
+
+
+def _row_error(errors) -> str:
+    if isinstance(errors, dict):
+        for name, value in errors.items():
+            message = _first_error_message(value)
+            return message if name == "non_field_errors" else f"{name}: {message}"
+    return _first_error_message(errors)
+
+
+def _validated_import_rows(rows: Iterable) -> Iterator[ImportRow]:
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            yield ImportRow(number=number, error="Row must be an object")
+            continue
+
+        product_id = None
+        if row.get("id") not in (None, ""):
+            try:
+                product_id = str(uuid.UUID(str(row["id"])))
+            except ValueError:
+                yield ImportRow(number=number, error="id: Must be a valid UUID.")
+                continue
+
+        serializer = ProductWriteSerializer(data=row, partial=product_id is not None)
+        if not serializer.is_valid():
+            yield ImportRow(number=number, error=_row_error(serializer.errors))
+            continue
+        yield ImportRow(number=number, product_id=product_id, data=dict(serializer.validated_data))
+
+
+def _import_source_rows(request) -> Iterable:
+    """Raw rows from a CSV body, a multipart `file` upload (CSV) or a JSON array."""
+
+    content_type = (request.content_type or "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        stream = request.stream
+        lines = iter(stream.readline, b"") if stream is not None else iter(())
+        return iter_csv_rows(codecs.iterdecode(lines, "utf-8-sig"))
+
+    if content_type == "multipart/form-data":
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValueError("file is required")
+        return iter_csv_rows(codecs.iterdecode(upload, "utf-8-sig"))
+
+    data = request.data
+    if isinstance(data, dict):
+        data = data.get("products")
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of products")
+    return data
+
+
 class VendorProductViewSet(viewsets.ViewSet):
     permission_classes = [IsVendor]
 
     def list(self, request):
         try:
-            qs = list_vendor_products(user=request.user)
+            vendor_id = get_vendor_for_user(user=request.user).id
         except ObjectDoesNotExist:
             return _error("Vendor profile not found", http_status=status.HTTP_404_NOT_FOUND)
-        return _success(ProductSerializer(qs, many=True).data)
+
+        def _build() -> Response:
+            try:
+                qs = list_vendor_products(user=request.user)
+            except ObjectDoesNotExist:
+                return _error("Vendor profile not found", http_status=status.HTTP_404_NOT_FOUND)
+            return _success(vendor_product_rows(qs.values_list(*VENDOR_PRODUCT_COLUMNS)))
+
+        return _conditional(
+            request,
+            version=get_catalog_version(vendor_id=vendor_id),
+            etag_parts=("vendor-products", vendor_id),
+            build=_build,
+            cache_control="private, no-cache",
+        )
 
     def retrieve(self, request, pk=None):
         try:
@@ -103,17 +277,177 @@ class VendorProductViewSet(viewsets.ViewSet):
             return _error("Product not found", http_status=status.HTTP_404_NOT_FOUND)
         return _success({"deleted": True})
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        try:
+            rows = _import_source_rows(request)
+        except ValueError as e:
+            return _error(str(e), http_status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            result = import_vendor_products(user=request.user, rows=_validated_import_rows(rows))
+        except ObjectDoesNotExist:
+            return _error("Vendor profile not found", http_status=status.HTTP_404_NOT_FOUND)
+        except (UnicodeDecodeError, csv.Error) as e:
+            # Raised while reading the upload, before anything is written.
+            message = "CSV must be UTF-8 encoded" if isinstance(e, UnicodeDecodeError) else f"Malformed CSV: {e}"
+            return _error(message, http_status=status.HTTP_400_BAD_REQUEST)
+
+        return _success({"created": result.created, "updated": result.updated, "errors": result.errors})
+
+    @action(detail=False, methods=["post"], url_path="bulk-stock")
+    def bulk_stock(self, request):
+        serializer = BulkStockSerializer(data=request.data)
+        if not serializer.is_valid():
+            return _error(
+                _first_error_message(serializer.errors),
+                http_status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            vendor = get_vendor_for_user(user=request.user)
+        except ObjectDoesNotExist:
+            return _error("Vendor profile not found", http_status=status.HTTP_404_NOT_FOUND)
+
+        result = set_vendor_stock(
+            vendor=vendor,
+            stock=serializer.validated_data["stock"],
+            expected=serializer.validated_data.get("expected_stock"),
+        )
+        return _success({"updated": result.updated, "conflicts": result.conflicts, "not_found": result.not_found})
+
 
 class CatalogProductViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
 
     def list(self, request):
-        qs = list_public_products()
-        return _success(CatalogProductSerializer(qs, many=True).data)
+        query = CatalogQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return _error(_first_error_message(query.errors), http_status=status.HTTP_400_BAD_REQUEST)
 
-    def retrieve(self, request, pk=None):
+        filters = query.validated_data
+        version, version_parts = self._catalog_version(
+            request, vendor_id=filters.get("vendor_id"), queryset=lambda: list_public_products(**filters)
+        )
+        return _conditional(
+            request,
+            version=version,
+            # Absolute URI: the body's pagination links carry scheme and host, and the
+            # ETag doubles as the shared cache key.
+            etag_parts=("catalog-list", request.build_absolute_uri(), *version_parts),
+            build=lambda: self._paginated(request, list_public_products(**filters)),
+            shared_cache=True,
+        )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        query = CatalogSearchQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return _error(_first_error_message(query.errors), http_status=status.HTTP_400_BAD_REQUEST)
+
+        filters = dict(query.validated_data)
+        text = filters.pop("q")
+        version, version_parts = self._catalog_version(
+            request,
+            vendor_id=filters.get("vendor_id"),
+            queryset=lambda: search_public_products(query=text, **filters),
+        )
+        return _conditional(
+            request,
+            version=version,
+            etag_parts=("catalog-search", request.build_absolute_uri(), *version_parts),
+            build=lambda: self._paginated(request, search_public_products(query=text, **filters)),
+        )
+
+    def _catalog_version(self, request, *, vendor_id, queryset: Callable) -> tuple[CatalogVersion, tuple]:
+        """Version and extra ETag parts for a catalog page.
+
+        A vendor-filtered page uses that vendor's version. An unfiltered page is composed
+        from the global version (which products are listed) and the versions of the vendors
+        on it (their stock), so an order only invalidates the pages showing its vendor.
+        """
+
+        if vendor_id is not None:
+            return get_catalog_version(vendor_id=vendor_id), ()
+
+        version = get_catalog_version()
+        page_key = request.build_absolute_uri()
+        vendor_ids = get_page_vendor_ids(version=version, page_key=page_key)
+        if vendor_ids is None:
+            # Once per page and global version: two cheap queries to learn the page's vendors.
+            paginator = CatalogPagination()
+            try:
+                page = paginator.paginate_queryset(queryset().values_list("vendor_id", flat=True), request, view=self)
+            except NotFound:
+                page = []
+            vendor_ids = sorted(set(page))
+            remember_page_vendor_ids(version=version, page_key=page_key, vendor_ids=vendor_ids)
+        return get_page_catalog_version(version=version, vendor_ids=vendor_ids)
+
+    def _paginated(self, request, qs):
+        paginator = CatalogPagination()
         try:
-            product = get_public_product(product_id=pk)
-        except ObjectDoesNotExist:
-            return _error("Product not found", http_status=status.HTTP_404_NOT_FOUND)
-        return _success(CatalogProductSerializer(product).data)
+            page = paginator.paginate_queryset(qs.values_list(*CATALOG_PRODUCT_COLUMNS), request, view=self)
+        except NotFound:
+            return _error("Invalid page", http_status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {
+                "success": True,
+                "data": catalog_product_rows(page),
+                "pagination": paginator.get_pagination_meta(),
+            }
+        )
+
+    def retrieve(self, request, pk=None):
+        # Resolve the vendor first so the ETag is always scoped to its version.
+        vendor_id = get_product_vendor_id(product_id=pk)
+        if vendor_id is None:
+            try:
+                vendor_id = get_public_product_vendor_id(product_id=pk)
+            except ObjectDoesNotExist:
+                return _error("Product not found", http_status=status.HTTP_404_NOT_FOUND)
+            remember_product_vendor_id(product_id=pk, vendor_id=vendor_id)
+
+        def _build() -> Response:
+            try:
+                product = get_public_product(product_id=pk)
+            except ObjectDoesNotExist:
+                return _error("Product not found", http_status=status.HTTP_404_NOT_FOUND)
+            return _success(CatalogProductSerializer(product).data)
+
+        return _conditional(
+            request,
+            version=get_catalog_version(vendor_id=vendor_id),
+            etag_parts=_product_etag_parts(vendor_id=vendor_id, product_id=pk),
+            build=_build,
+            shared_cache=True,
+        )
+
+
+def _product_etag_parts(*, vendor_id, product_id) -> tuple:
+    return ("catalog-product", vendor_id, product_id)
+
+
+@fast_path()
+async def catalog_product_detail_fast(request, user, pk=None) -> HttpResponse:
+    """CatalogProductViewSet.retrieve for revalidations and warm shared-cache hits.
+
+    A cold entry, or a product whose vendor is not cached yet, falls back to the DRF view,
+    which resolves the vendor and renders the body once (single-flight) for everyone.
+    """
+
+    vendor_id = await aget_product_vendor_id(product_id=pk)
+    if vendor_id is None:
+        raise Fallback
+    version = await aget_catalog_version(vendor_id=vendor_id)
+    etag = catalog_etag(version.version, *_product_etag_parts(vendor_id=vendor_id, product_id=pk))
+    last_modified = int(version.modified_at)
+
+    if _is_not_modified(request, etag=etag, last_modified=last_modified):
+        response = not_modified_response()
+    else:
+        body = await aget_cached(key=etag.strip('"'))
+        if body is None:
+            raise Fallback
+        response = rendered_json_response(body)
+    return _with_validators(response, etag=etag, last_modified=last_modified, cache_control="no-cache")
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiderEarnings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('total', 'Total')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('delivered_orders', models.PositiveIntegerField(default=0)),
+                ('delivered_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('rider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='earnings', to='riders.rider')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('rider', 'period', 'period_start'), name='uniq_rider_earnings_period')],
+            },
+        ),
+    ]
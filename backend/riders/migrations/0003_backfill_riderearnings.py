@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:05
+
+from django.db import migrations
+
+from riders.services.rider_earnings_service import build_rider_earnings
+
+
+def backfill_rider_earnings(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    RiderEarnings = apps.get_model("riders", "RiderEarnings")
+    RiderEarnings.objects.all().delete()
+    RiderEarnings.objects.bulk_create(
+        build_rider_earnings(
+            Order.objects.filter(status="delivered", rider__isnull=False), model=RiderEarnings
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('riders', '0002_riderearnings'),
+        ('orders', '0003_order_delivery_address_order_payment_method_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rider_earnings, migrations.RunPython.noop),
+    ]
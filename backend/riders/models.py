@@ -20,3 +20,33 @@ class Rider(models.Model):
 
     def __str__(self) -> str:
         return f"Rider({self.user_id})"
+
+
+class RiderEarnings(models.Model):
+    """Running delivered-order totals per rider, kept for day, ISO week and all-time periods.
+
+    Written in the same transaction that marks an order delivered so reads are a
+    single indexed lookup (or O(days) for custom ranges).
+    """
+
+    class Period(models.TextChoices):
+        DAY = "day", "Day"
+        WEEK = "week", "Week"
+        TOTAL = "total", "Total"
+
+    rider = models.ForeignKey("riders.Rider", on_delete=models.CASCADE, related_name="earnings")
+    period = models.CharField(max_length=10, choices=Period.choices)
+    period_start = models.DateField()
+
+    delivered_orders = models.PositiveIntegerField(default=0)
+    delivered_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["rider", "period", "period_start"], name="uniq_rider_earnings_period"),
+        ]
+
+    def __str__(self) -> str:
+        return f"RiderEarnings({self.rider_id}, {self.period}, {self.period_start})"
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from config.rollups import add_to_rollup, delivery_day, replace_rollup_rows
+from orders.models import Order
+from riders.models import Rider, RiderEarnings
+
+
+# All-time rows share a fixed period_start so they stay on the same unique index.
+TOTAL_PERIOD_START = date(1970, 1, 1)
+
+
+def week_start(day: date) -> date:
+    """Return the Monday of `day`'s ISO week."""
+
+    return day - timedelta(days=day.weekday())
+
+
+def _periods_for(day: date) -> list[tuple[str, date]]:
+    return [
+        (RiderEarnings.Period.DAY, day),
+        (RiderEarnings.Period.WEEK, week_start(day)),
+        (RiderEarnings.Period.TOTAL, TOTAL_PERIOD_START),
+    ]
+
+
+def record_delivery(*, rider: Rider, amount: Decimal, delivered_at: datetime | None = None) -> None:
+    """Add one delivered order to the rider's day/week/total rows.
+
+    Call inside the transaction that marks the order delivered, once its conditional
+    status UPDATE has succeeded, so a delivery is never credited twice.
+    """
+
+    day = timezone.localdate(delivered_at or timezone.now())
+
+    for period, period_start in _periods_for(day):
+        add_to_rollup(
+            RiderEarnings,
+            key={"rider": rider, "period": period, "period_start": period_start},
+            deltas={"delivered_orders": 1, "delivered_amount": amount},
+        )
+
+
+def _summary(row: dict | None) -> dict:
+    row = row or {}
+    return {
+        "delivered_orders": int(row.get("delivered_orders") or 0),
+        "total_delivered_amount": row.get("delivered_amount") or Decimal("0"),
+    }
+
+
+def _get_period(*, rider: Rider, period: str, period_start: date) -> dict:
+    row = (
+        RiderEarnings.objects.filter(rider=rider, period=period, period_start=period_start)
+        .values("delivered_orders", "delivered_amount")
+        .first()
+    )
+    return _summary(row)
+
+
+def get_total_earnings(*, rider: Rider) -> dict:
+    return _get_period(rider=rider, period=RiderEarnings.Period.TOTAL, period_start=TOTAL_PERIOD_START)
+
+
+def get_day_earnings(*, rider: Rider, day: date | None = None) -> dict:
+    day = day or timezone.localdate()
+    return _get_period(rider=rider, period=RiderEarnings.Period.DAY, period_start=day)
+
+
+def get_week_earnings(*, rider: Rider, day: date | None = None) -> dict:
+    day = day or timezone.localdate()
+    return _get_period(rider=rider, period=RiderEarnings.Period.WEEK, period_start=week_start(day))
+
+
+def get_range_earnings(*, rider: Rider, start: date, end: date) -> dict:
+    """Sum day rows in [start, end] (inclusive); O(days), never touches orders."""
+
+    if start > end:
+        raise ValueError("start must be on or before end")
+
+    row = RiderEarnings.objects.filter(
+        rider=rider,
+        period=RiderEarnings.Period.DAY,
+        period_start__gte=start,
+        period_start__lte=end,
+    ).aggregate(delivered_orders=Sum("delivered_orders"), delivered_amount=Sum("delivered_amount"))
+    return _summary(row)
+
+
+def build_rider_earnings(delivered, *, model=RiderEarnings) -> list:
+    """Compute (unsaved) `model` ledger rows for the `delivered` orders queryset.
+
+    `model` and `delivered` may be historical models, so the backfill migration shares this.
+    """
+
+    tz = timezone.get_current_timezone()
+    rows: dict[tuple[int, str, date], RiderEarnings] = {}
+
+    per_day = (
+        delivered.annotate(day=delivery_day(tz))
+        .values("rider_id", "day")
+        .annotate(c=Count("id"), total=Sum("total_amount"))
+    )
+    for r in per_day:
+        for period, period_start in _periods_for(r["day"]):
+            key = (r["rider_id"], period, period_start)
+            if key not in rows:
+                rows[key] = model(rider_id=r["rider_id"], period=period, period_start=period_start)
+            rows[key].delivered_orders += r["c"]
+            rows[key].delivered_amount += r["total"] or Decimal("0")
+
+    return list(rows.values())
+
+
+@transaction.atomic
+def rebuild_rider_earnings(*, rider_id: int | None = None) -> int:
+    """Recompute ledger rows from delivered orders. Returns the number of rows written."""
+
+    delivered = Order.objects.filter(status=Order.Status.DELIVERED, rider__isnull=False)
+    ledger_qs = RiderEarnings.objects.all()
+    if rider_id is not None:
+        delivered = delivered.filter(rider_id=rider_id)
+        ledger_qs = ledger_qs.filter(rider_id=rider_id)
+
+    return replace_rollup_rows(ledger_qs, build_rider_earnings(delivered))
@@ -1,14 +1,114 @@
 from __future__ import annotations
 
-from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
 
 from riders.models import Rider
 from users.models import User
 
 
+# user -> rider is one-to-one and never reassigned, so the id mapping can live long;
+# deleting a Rider clears it (riders/signals.py).
+RIDER_ID_CACHE_TTL_SECONDS = 60 * 60 * 24
+
+
+def _rider_id_cache_key(user_id) -> str:
+    return f"rider_id_for_user:{user_id}"
+
+
+def forget_rider_id(*, user_id) -> None:
+    # Also after commit, so a concurrent reader cannot re-cache the deleted row's id.
+    cache.delete(_rider_id_cache_key(user_id))
+    transaction.on_commit(lambda: cache.delete(_rider_id_cache_key(user_id)))
+
+
+def ensure_rider_for_user(user: User) -> Rider:
+    """Create-once path (called at login): make sure the profile exists and prime the id cache."""
+
+    rider, _ = Rider.objects.get_or_create(user=user)
+    rider_id = rider.pk
+    transaction.on_commit(
+        lambda: cache.set(_rider_id_cache_key(user.pk), rider_id, timeout=RIDER_ID_CACHE_TTL_SECONDS)
+    )
+    return rider
+
+
 @transaction.atomic
 def get_or_create_rider_for_user(user: User) -> Rider:
-    rider, _ = Rider.objects.get_or_create(user=user)
+    return ensure_rider_for_user(user)
+
+
+def get_rider_id_for_user(user: User) -> int:
+    """Cached rider id for a user; a plain indexed read on a miss, no transaction."""
+
+    rider_id = cache.get(_rider_id_cache_key(user.pk))
+    if rider_id is not None:
+        return int(rider_id)
+
+    rider_id = Rider.objects.filter(user=user).values_list("pk", flat=True).first()
+    if rider_id is None:
+        # Accounts that have not logged in since riders started being provisioned at login.
+        return get_or_create_rider_for_user(user).pk
+
+    cache.set(_rider_id_cache_key(user.pk), rider_id, timeout=RIDER_ID_CACHE_TTL_SECONDS)
+    return rider_id
+
+
+async def aget_rider_id_for_user(user: User) -> int:
+    rider_id = await cache.aget(_rider_id_cache_key(user.pk))
+    if rider_id is not None:
+        return int(rider_id)
+
+    rider_id = await Rider.objects.filter(user=user).values_list("pk", flat=True).afirst()
+    if rider_id is None:
+        return (await sync_to_async(get_or_create_rider_for_user)(user)).pk
+
+    await cache.aset(_rider_id_cache_key(user.pk), rider_id, timeout=RIDER_ID_CACHE_TTL_SECONDS)
+    return rider_id
+
+
+def _rider_ref(user: User, rider_id: int) -> Rider:
+    # The primary's row by identity; no router call, so reads stay eligible for the replica.
+    rider = Rider.from_db(DEFAULT_DB_ALIAS, ["id", "user_id"], [rider_id, user.pk])
+    rider.user = user
+    return rider
+
+
+def get_rider_ref_for_user(user: User) -> Rider:
+    """Rider with only `id`/`user_id` loaded; no query on a cache hit.
+
+    For callers that only need the identity (filters, ownership checks, FK assignment).
+    Other fields are deferred and would each cost a query if accessed.
+    """
+
+    return _rider_ref(user, get_rider_id_for_user(user))
+
+
+async def aget_rider_ref_for_user(user: User) -> Rider:
+    return _rider_ref(user, await aget_rider_id_for_user(user))
+
+
+def get_rider_for_user(user: User) -> Rider:
+    """Full rider row by primary key (profile responses and writes), no transaction."""
+
+    try:
+        rider = Rider.objects.get(pk=get_rider_id_for_user(user))
+    except Rider.DoesNotExist:
+        # Id cached before the rider was deleted (e.g. in another worker's local cache).
+        forget_rider_id(user_id=user.pk)
+        rider = Rider.objects.get(pk=get_rider_id_for_user(user))
+    rider.user = user
+    return rider
+
+
+async def aget_rider_for_user(user: User) -> Rider:
+    # One indexed read by user_id instead of id-cache + pk: each await is a thread hop here.
+    try:
+        rider = await Rider.objects.aget(user=user)
+    except Rider.DoesNotExist:
+        rider = await sync_to_async(get_or_create_rider_for_user)(user)
+    rider.user = user
     return rider
 
 
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from riders.models import Rider
+from riders.services.rider_service import forget_rider_id
+
+
+@receiver(post_delete, sender=Rider, dispatch_uid="riders.forget_deleted_rider_id")
+def forget_deleted_rider_id(sender, instance: Rider, **kwargs) -> None:
+    forget_rider_id(user_id=instance.user_id)
@@ -1,8 +1,10 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import RiderViewSet
+from config.async_views import with_fast_paths
+
+from .views import RiderViewSet, rider_me_fast
 
 router = DefaultRouter()
 router.register(r"riders", RiderViewSet, basename="riders")
 
-urlpatterns = router.urls
+urlpatterns = with_fast_paths(router.urls, {"riders-me": rider_me_fast})
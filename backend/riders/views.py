@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from django.http import HttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from config.async_views import fast_path, json_response
 from users.permissions import IsRider
 
 from .serializers import (
@@ -11,14 +13,14 @@ from .serializers import (
     RiderOnlineToggleSerializer,
     RiderProfileSerializer,
 )
-from .services.rider_service import get_or_create_rider_for_user, toggle_online, update_location
+from .services.rider_service import aget_rider_for_user, get_rider_for_user, toggle_online, update_location
 
 
 class RiderViewSet(viewsets.ViewSet):
     permission_classes = [IsRider]
 
     def _get_rider(self, request):
-        return get_or_create_rider_for_user(request.user)
+        return get_rider_for_user(request.user)
 
     @action(detail=False, methods=["get"], url_path="me")
     def me(self, request):
@@ -44,3 +46,9 @@ class RiderViewSet(viewsets.ViewSet):
             serializer.validated_data["current_lng"],
         )
         return Response(RiderProfileSerializer(rider).data, status=status.HTTP_200_OK)
+
+
+@fast_path(role="rider")
+async def rider_me_fast(request, user) -> HttpResponse:
+    rider = await aget_rider_for_user(user)
+    return json_response(RiderProfileSerializer(rider).data)
@@ -1,15 +1,16 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-echo "Running migrations..."
-python manage.py migrate --noinput
+# Migrations and static files belong to the web service; realtime processes just start.
+if [ "${SERVER_ROLE:-all}" != "realtime" ]; then
+  echo "Running migrations..."
+  python manage.py migrate --noinput
 
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+  echo "Collecting static files..."
+  python manage.py collectstatic --noinput
+fi
 
-echo "Starting gunicorn..."
-exec gunicorn config.wsgi:application \
-  --bind 0.0.0.0:${PORT:-8000} \
-  --workers ${WEB_CONCURRENCY:-2} \
-  --threads ${GUNICORN_THREADS:-2} \
-  --timeout ${GUNICORN_TIMEOUT:-60}
+# Web process only. With STOCK_RESERVATIONS_ENABLED, also run the Procfile `worker` command.
+# Workers, threads, keepalive, WebSocket pings and graceful drain: config/server.py.
+echo "Starting gunicorn (mode=${SERVER_MODE:-asgi}, role=${SERVER_ROLE:-all})..."
+exec gunicorn --config config/gunicorn.conf.py
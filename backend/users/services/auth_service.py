@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from django.db import transaction
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from riders.services.rider_service import ensure_rider_for_user
 from users.models import User
 
 
@@ -42,6 +43,10 @@ def login_with_phone(phone: str, otp: str, *, name_if_create: str | None = None,
     if not user.is_active:
         raise ValueError("User is inactive")
 
+    # Provision the rider profile once here so rider requests only ever read it.
+    if user.role == User.Role.RIDER:
+        ensure_rider_for_user(user)
+
     # Issue JWT
     refresh = RefreshToken.for_user(user)
     return LoginResult(user=user, access=str(refresh.access_token), refresh=str(refresh))
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+
+
+# Grid cell edge in degrees (~11 km of latitude). Vendors are bucketed by cell so a
+# radius query only has to look at the handful of cells overlapping its bounding box.
+GRID_CELL_DEGREES = 0.1
+
+KM_PER_DEGREE_LAT = 111.32
+
+
+def grid_cell_for(lat: float | Decimal, lng: float | Decimal) -> str:
+    row = math.floor(float(lat) / GRID_CELL_DEGREES)
+    col = math.floor(float(lng) / GRID_CELL_DEGREES)
+    return f"{row}:{col}"
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lng, max_lng) enclosing a circle of `radius_km`."""
+
+    d_lat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    d_lng = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    return (
+        max(lat - d_lat, -90.0),
+        min(lat + d_lat, 90.0),
+        max(lng - d_lng, -180.0),
+        min(lng + d_lng, 180.0),
+    )
+
+
+def cells_covering(lat: float, lng: float, radius_km: float) -> list[str]:
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    rows = range(math.floor(min_lat / GRID_CELL_DEGREES), math.floor(max_lat / GRID_CELL_DEGREES) + 1)
+    cols = range(math.floor(min_lng / GRID_CELL_DEGREES), math.floor(max_lng / GRID_CELL_DEGREES) + 1)
+    return [f"{r}:{c}" for r in rows for c in cols]
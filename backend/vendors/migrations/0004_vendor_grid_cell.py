@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+from vendors.geo import grid_cell_for
+
+
+def backfill_grid_cell(apps, schema_editor):
+    Vendor = apps.get_model("vendors", "Vendor")
+    vendors = list(Vendor.objects.only("id", "latitude", "longitude"))
+    for vendor in vendors:
+        vendor.grid_cell = grid_cell_for(vendor.latitude, vendor.longitude)
+    Vendor.objects.bulk_update(vendors, ["grid_cell"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0003_vendordailystats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vendor',
+            name='grid_cell',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['grid_cell', 'is_open'], name='vendor_grid_open_idx'),
+        ),
+        migrations.RunPython(backfill_grid_cell, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:05
+
+from django.db import migrations
+
+from vendors.services.vendor_stats_service import build_vendor_daily_stats
+
+
+def backfill_vendor_daily_stats(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    VendorDailyStats = apps.get_model("vendors", "VendorDailyStats")
+    VendorDailyStats.objects.all().delete()
+    VendorDailyStats.objects.bulk_create(
+        build_vendor_daily_stats(Order.objects.all(), model=VendorDailyStats), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendors', '0004_vendor_grid_cell'),
+        ('orders', '0003_order_delivery_address_order_payment_method_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_vendor_daily_stats, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,8 @@ from __future__ import annotations
 from django.conf import settings
 from django.db import models
 
+from vendors.geo import grid_cell_for
+
 
 class Vendor(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="vendor_profile")
@@ -13,6 +15,22 @@ class Vendor(models.Model):
     longitude = models.DecimalField(max_digits=9, decimal_places=6)
     is_open = models.BooleanField(default=True)
 
+    # Derived from latitude/longitude on save (see vendors.geo); spatial prefilter.
+    grid_cell = models.CharField(max_length=32, blank=True, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["grid_cell", "is_open"], name="vendor_grid_open_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.grid_cell = grid_cell_for(self.latitude, self.longitude)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "grid_cell"}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return self.shop_name
 
@@ -37,3 +55,38 @@ class VendorKyc(models.Model):
 
     def __str__(self) -> str:
         return f"VendorKYC({self.vendor_id}, {self.status})"
+
+
+class VendorDailyStats(models.Model):
+    """Per-vendor, per-day order rollup so dashboards read O(days) rows instead of O(orders).
+
+    Status counters are bucketed by the day the order was placed and move between
+    columns as the order transitions. `completed_*` is bucketed by the day the order
+    was delivered.
+    """
+
+    vendor = models.ForeignKey("vendors.Vendor", on_delete=models.CASCADE, related_name="daily_stats")
+    date = models.DateField()
+
+    orders_count = models.PositiveIntegerField(default=0)
+    orders_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    placed_count = models.IntegerField(default=0)
+    accepted_count = models.IntegerField(default=0)
+    ready_count = models.IntegerField(default=0)
+    picked_count = models.IntegerField(default=0)
+    delivered_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+
+    completed_count = models.PositiveIntegerField(default=0)
+    completed_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["vendor", "date"], name="uniq_vendor_daily_stats"),
+        ]
+
+    def __str__(self) -> str:
+        return f"VendorDailyStats({self.vendor_id}, {self.date})"
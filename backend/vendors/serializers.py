@@ -71,6 +71,27 @@ class VendorSalesSummarySerializer(serializers.Serializer):
     pending_orders_count = serializers.IntegerField()
 
 
+class NearbyVendorsQuerySerializer(serializers.Serializer):
+    """Query params for GET /api/catalog/vendors/nearby/."""
+
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(required=False, default=5, min_value=0.1, max_value=25)
+    open_only = serializers.BooleanField(required=False, default=True)
+
+
+class NearbyVendorSerializer(serializers.Serializer):
+    """Response item for GET /api/catalog/vendors/nearby/."""
+
+    id = serializers.IntegerField(source="vendor.id")
+    shop_name = serializers.CharField(source="vendor.shop_name")
+    address = serializers.CharField(source="vendor.address")
+    latitude = serializers.DecimalField(source="vendor.latitude", max_digits=9, decimal_places=6)
+    longitude = serializers.DecimalField(source="vendor.longitude", max_digits=9, decimal_places=6)
+    is_open = serializers.BooleanField(source="vendor.is_open")
+    distance_km = serializers.FloatField()
+
+
 class VendorKycSerializer(serializers.ModelSerializer):
     class Meta:
         model = VendorKyc
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from orders.services.rider_assignment_service import haversine_km
+from vendors.geo import bounding_box, cells_covering
+from vendors.models import Vendor
+
+
+@dataclass(frozen=True)
+class NearbyVendor:
+    vendor: Vendor
+    distance_km: float
+
+
+def list_nearby_vendors(*, lat: float, lng: float, radius_km: float, open_only: bool = True) -> list[NearbyVendor]:
+    """Vendors within `radius_km`, nearest first.
+
+    One indexed query: grid cells overlapping the search circle (vendor_grid_open_idx)
+    narrowed by a lat/lng bounding box; exact distance uses the same haversine as
+    rider assignment.
+    """
+
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    qs = Vendor.objects.filter(
+        grid_cell__in=cells_covering(lat, lng, radius_km),
+        latitude__gte=min_lat,
+        latitude__lte=max_lat,
+        longitude__gte=min_lng,
+        longitude__lte=max_lng,
+    ).only("id", "shop_name", "address", "latitude", "longitude", "is_open")
+    if open_only:
+        qs = qs.filter(is_open=True)
+
+    nearby: list[NearbyVendor] = []
+    for vendor in qs:
+        distance = haversine_km(lat1=lat, lon1=lng, lat2=float(vendor.latitude), lon2=float(vendor.longitude))
+        if distance <= radius_km:
+            nearby.append(NearbyVendor(vendor=vendor, distance_km=distance))
+
+    nearby.sort(key=lambda n: (n.distance_km, n.vendor.id))
+    return nearby
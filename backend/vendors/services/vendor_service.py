@@ -3,11 +3,15 @@ from __future__ import annotations
 from dataclasses import dataclass
 from decimal import Decimal
 
-from django.db.models import Count, Sum
-from django.utils import timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 
-from orders.models import Order
+from config.db_routing import primary_reads, replica_read
+
+from products.services.catalog_version_service import bump_catalog_version
 from vendors.models import Vendor
+from vendors.services.vendor_stats_service import get_vendor_stats_totals
 
 
 @dataclass(frozen=True)
@@ -17,12 +21,61 @@ class VendorSalesSummary:
     pending_orders_count: int
 
 
+# Request-scoped memo: stored on the (per-request) user instance.
+_MEMO_ATTR = "_vendor_profile_memo"
+
+
+def _vendor_cache_key(user_id) -> str:
+    return f"vendor_for_user:{user_id}"
+
+
+def _vendor_cache_ttl() -> int:
+    return int(getattr(settings, "VENDOR_CACHE_TTL_SECONDS", 60))
+
+
+def _remember_vendor(*, user, vendor: Vendor) -> Vendor:
+    # Attach the caller's user instead of caching a (possibly stale) copy with the vendor.
+    vendor.user = user
+    setattr(user, _MEMO_ATTR, vendor)
+    return vendor
+
+
 def get_vendor_for_user(*, user) -> Vendor:
-    return Vendor.objects.select_related("user").get(user=user)
+    """The user's vendor profile: request memo, then a short-TTL cache, then the DB.
+
+    Raises Vendor.DoesNotExist like the plain query. Profile writes go through
+    `update_vendor_profile`/`toggle_vendor_open`, which refresh both layers.
+    """
+
+    memo = getattr(user, _MEMO_ATTR, None)
+    if memo is not None:
+        return memo
+
+    ttl = _vendor_cache_ttl()
+    vendor = cache.get(_vendor_cache_key(user.pk)) if ttl > 0 else None
+    if vendor is None:
+        # The copy is cached for other requests, so never take it from a lagging replica.
+        with primary_reads():
+            vendor = Vendor.objects.get(user=user)
+        if ttl > 0:
+            cache.set(_vendor_cache_key(user.pk), vendor, timeout=ttl)
+
+    return _remember_vendor(user=user, vendor=vendor)
+
+
+def _get_vendor_for_update(*, user) -> Vendor:
+    # Writes start from the DB row so a stale cached copy is never saved back.
+    return _remember_vendor(user=user, vendor=Vendor.objects.get(user=user))
+
+
+def _forget_vendor(*, user_id) -> None:
+    # Also after commit, so a concurrent reader cannot re-cache the pre-update row.
+    cache.delete(_vendor_cache_key(user_id))
+    transaction.on_commit(lambda: cache.delete(_vendor_cache_key(user_id)))
 
 
 def update_vendor_profile(*, user, **fields) -> Vendor:
-    vendor = get_vendor_for_user(user=user)
+    vendor = _get_vendor_for_update(user=user)
 
     allowed = {"shop_name", "address", "latitude", "longitude", "is_open"}
     update_fields: list[str] = []
@@ -35,70 +88,46 @@ def update_vendor_profile(*, user, **fields) -> Vendor:
 
     if update_fields:
         vendor.save(update_fields=update_fields)
+        _forget_vendor(user_id=user.pk)
+        # Catalog responses embed shop name and are filtered by is_open.
+        bump_catalog_version(vendor_id=vendor.id)
 
     return vendor
 
 
 def toggle_vendor_open(*, user) -> bool:
-    vendor = get_vendor_for_user(user=user)
+    vendor = _get_vendor_for_update(user=user)
     vendor.is_open = not vendor.is_open
     vendor.save(update_fields=["is_open"])
+    _forget_vendor(user_id=user.pk)
+    bump_catalog_version(vendor_id=vendor.id)
     return bool(vendor.is_open)
 
 
+@replica_read
 def get_vendor_dashboard(*, user) -> dict:
     vendor = get_vendor_for_user(user=user)
-
-    now = timezone.localtime(timezone.now())
-    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    vendor_orders = Order.objects.filter(vendor=vendor)
-    today_orders_qs = vendor_orders.filter(created_at__gte=start_of_day)
-
-    status_counts = dict(
-        vendor_orders.values("status").annotate(c=Count("id")).values_list("status", "c")
-    )
-
-    today_orders = today_orders_qs.count()
-    today_revenue = today_orders_qs.aggregate(total=Sum("total_amount"))["total"] or Decimal("0")
+    stats = get_vendor_stats_totals(vendor=vendor)
 
     return {
         "shop_name": vendor.shop_name,
         "is_open": vendor.is_open,
-        "placed_orders": int(status_counts.get(Order.Status.PLACED, 0)),
-        "accepted_orders": int(status_counts.get(Order.Status.ACCEPTED, 0)),
-        "ready_orders": int(status_counts.get(Order.Status.READY, 0)),
-        "picked_orders": int(status_counts.get(Order.Status.PICKED, 0)),
-        "today_orders": int(today_orders),
-        "today_revenue": today_revenue,
+        "placed_orders": stats["placed_count"],
+        "accepted_orders": stats["accepted_count"],
+        "ready_orders": stats["ready_count"],
+        "picked_orders": stats["picked_count"],
+        "today_orders": stats["today_orders_count"],
+        "today_revenue": stats["today_orders_revenue"],
     }
 
 
+@replica_read
 def get_vendor_sales_summary(*, user) -> VendorSalesSummary:
     vendor = get_vendor_for_user(user=user)
-
-    now = timezone.localtime(timezone.now())
-    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    completed_statuses = [Order.Status.DELIVERED]
-    pending_statuses = [Order.Status.PLACED, Order.Status.ACCEPTED, Order.Status.READY]
-
-    completed_orders_count = (
-        Order.objects.filter(vendor=vendor, status__in=completed_statuses).count()
-    )
-    pending_orders_count = Order.objects.filter(vendor=vendor, status__in=pending_statuses).count()
-
-    today_total_sales = (
-        Order.objects.filter(
-            vendor=vendor,
-            status__in=completed_statuses,
-            updated_at__gte=start_of_day,
-        ).aggregate(total=Sum("total_amount"))["total"]
-        or Decimal("0")
-    )
+    stats = get_vendor_stats_totals(vendor=vendor)
 
     return VendorSalesSummary(
-        today_total_sales=today_total_sales,
-        completed_orders_count=int(completed_orders_count),
-        pending_orders_count=int(pending_orders_count),
+        today_total_sales=stats["today_completed_revenue"],
+        completed_orders_count=stats["delivered_count"],
+        pending_orders_count=stats["placed_count"] + stats["accepted_count"] + stats["ready_count"],
     )
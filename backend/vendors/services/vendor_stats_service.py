@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from config.rollups import add_to_rollup, delivery_day, replace_rollup_rows
+from orders.models import Order
+from vendors.models import Vendor, VendorDailyStats
+
+
+STATUS_COUNT_FIELDS: dict[str, str] = {
+    Order.Status.PLACED: "placed_count",
+    Order.Status.ACCEPTED: "accepted_count",
+    Order.Status.READY: "ready_count",
+    Order.Status.PICKED: "picked_count",
+    Order.Status.DELIVERED: "delivered_count",
+    Order.Status.CANCELLED: "cancelled_count",
+}
+
+
+def _local_date(value: datetime | None) -> date:
+    return timezone.localdate(value or timezone.now())
+
+
+def _apply(*, vendor_id: int, day: date, deltas: dict[str, object]) -> None:
+    add_to_rollup(VendorDailyStats, key={"vendor_id": vendor_id, "date": day}, deltas=deltas)
+
+
+def record_order_placed(*, order: Order) -> None:
+    """Count a newly placed order.
+
+    Call as the last statement of the order creation transaction: the (vendor, day) row
+    stays locked until commit, and every order of the vendor needs it.
+    """
+
+    _apply(
+        vendor_id=order.vendor_id,
+        day=_local_date(order.created_at),
+        deltas={
+            "orders_count": 1,
+            "orders_revenue": order.total_amount,
+            STATUS_COUNT_FIELDS[order.status]: 1,
+        },
+    )
+
+
+def record_order_status_change(*, order: Order, from_status: str) -> None:
+    """Move an order between status counters after transition_order_status() succeeded.
+
+    Call inside the same transaction as the status update, and only for an update that
+    changed the row, so a transition is never counted twice.
+    """
+
+    to_status = order.status
+    if from_status == to_status:
+        return
+
+    deltas: dict[str, object] = {}
+    from_field = STATUS_COUNT_FIELDS.get(from_status)
+    to_field = STATUS_COUNT_FIELDS.get(to_status)
+    if from_field:
+        deltas[from_field] = -1
+    if to_field:
+        deltas[to_field] = 1
+
+    created_day = _local_date(order.created_at)
+    if to_status == Order.Status.DELIVERED:
+        completed = {"completed_count": 1, "completed_revenue": order.total_amount}
+        delivered_day = _local_date(order.updated_at)
+        if delivered_day == created_day:
+            deltas.update(completed)
+        else:
+            _apply(vendor_id=order.vendor_id, day=delivered_day, deltas=completed)
+
+    _apply(vendor_id=order.vendor_id, day=created_day, deltas=deltas)
+
+
+def get_vendor_stats_totals(*, vendor: Vendor, day: date | None = None) -> dict:
+    """Return all-time status totals plus the `day` (default: today) row for a vendor."""
+
+    day = day or _local_date(None)
+
+    totals = VendorDailyStats.objects.filter(vendor=vendor).aggregate(
+        **{field: Sum(field) for field in STATUS_COUNT_FIELDS.values()}
+    )
+    today = (
+        VendorDailyStats.objects.filter(vendor=vendor, date=day)
+        .values("orders_count", "orders_revenue", "completed_count", "completed_revenue")
+        .first()
+    ) or {}
+
+    result: dict[str, object] = {field: int(totals.get(field) or 0) for field in STATUS_COUNT_FIELDS.values()}
+    result.update(
+        {
+            "today_orders_count": int(today.get("orders_count") or 0),
+            "today_orders_revenue": today.get("orders_revenue") or Decimal("0"),
+            "today_completed_count": int(today.get("completed_count") or 0),
+            "today_completed_revenue": today.get("completed_revenue") or Decimal("0"),
+        }
+    )
+    return result
+
+
+def build_vendor_daily_stats(orders, *, model=VendorDailyStats) -> list:
+    """Compute (unsaved) `model` rows for the `orders` queryset.
+
+    `model` and `orders` may be historical models, so the backfill migration shares this.
+    """
+
+    tz = timezone.get_current_timezone()
+    rows: dict[tuple[int, date], VendorDailyStats] = {}
+
+    def _row(vid: int, day: date) -> VendorDailyStats:
+        key = (vid, day)
+        if key not in rows:
+            rows[key] = model(vendor_id=vid, date=day)
+        return rows[key]
+
+    by_status = (
+        orders.annotate(day=TruncDate("created_at", tzinfo=tz))
+        .values("vendor_id", "day", "status")
+        .annotate(c=Count("id"), total=Sum("total_amount"))
+    )
+    for r in by_status:
+        row = _row(r["vendor_id"], r["day"])
+        row.orders_count += r["c"]
+        row.orders_revenue += r["total"] or Decimal("0")
+        field = STATUS_COUNT_FIELDS.get(r["status"])
+        if field:
+            setattr(row, field, getattr(row, field) + r["c"])
+
+    completed = (
+        orders.filter(status=Order.Status.DELIVERED)
+        .annotate(day=delivery_day(tz))
+        .values("vendor_id", "day")
+        .annotate(c=Count("id"), total=Sum("total_amount"))
+    )
+    for r in completed:
+        row = _row(r["vendor_id"], r["day"])
+        row.completed_count += r["c"]
+        row.completed_revenue += r["total"] or Decimal("0")
+
+    return list(rows.values())
+
+
+@transaction.atomic
+def rebuild_vendor_daily_stats(*, vendor_id: int | None = None) -> int:
+    """Recompute rollup rows from order history. Returns the number of rows written."""
+
+    orders = Order.objects.all()
+    stats_qs = VendorDailyStats.objects.all()
+    if vendor_id is not None:
+        orders = orders.filter(vendor_id=vendor_id)
+        stats_qs = stats_qs.filter(vendor_id=vendor_id)
+
+    return replace_rollup_rows(stats_qs, build_vendor_daily_stats(orders))
@@ -1,8 +1,9 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import VendorViewSet
+from .views import CatalogVendorViewSet, VendorViewSet
 
 router = DefaultRouter()
 router.register(r"vendors", VendorViewSet, basename="vendors")
+router.register(r"catalog/vendors", CatalogVendorViewSet, basename="catalog-vendors")
 
 urlpatterns = router.urls
@@ -3,11 +3,15 @@ from __future__ import annotations
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import APIException, PermissionDenied, ValidationError
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from products.pagination import CatalogPagination
 from vendors.permissions import IsVendor
 from vendors.serializers import (
+    NearbyVendorSerializer,
+    NearbyVendorsQuerySerializer,
     VendorKycSerializer,
     VendorKycSubmitSerializer,
     VendorProfileSerializer,
@@ -21,6 +25,7 @@ from vendors.services.vendor_service import (
     toggle_vendor_open,
     update_vendor_profile,
 )
+from vendors.services.vendor_geo_service import list_nearby_vendors
 from vendors.services.vendor_kyc_service import get_vendor_kyc_status_for_user, submit_vendor_kyc_for_user
 
 
@@ -126,3 +131,28 @@ class VendorViewSet(viewsets.ViewSet):
             return _error(str(e.detail), http_status=getattr(e, "status_code", status.HTTP_400_BAD_REQUEST))
 
         return _success(VendorKycSerializer(kyc).data, http_status=status.HTTP_201_CREATED)
+
+
+class CatalogVendorViewSet(viewsets.ViewSet):
+    permission_classes = [AllowAny]
+
+    @action(detail=False, methods=["get"], url_path="nearby")
+    def nearby(self, request):
+        query = NearbyVendorsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return _error(_first_error_message(query.errors), http_status=status.HTTP_400_BAD_REQUEST)
+
+        vendors = list_nearby_vendors(**query.validated_data)
+
+        paginator = CatalogPagination()
+        try:
+            page = paginator.paginate_queryset(vendors, request, view=self)
+        except NotFound:
+            return _error("Invalid page", http_status=status.HTTP_404_NOT_FOUND)
+        return Response(
+            {
+                "success": True,
+                "data": NearbyVendorSerializer(page, many=True).data,
+                "pagination": paginator.get_pagination_meta(),
+            }
+        )
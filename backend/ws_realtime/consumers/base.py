@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Any
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from config.jsonlib import dumps_str, loads
+
+
+class JsonWebsocketConsumer(AsyncJsonWebsocketConsumer):
+    """AsyncJsonWebsocketConsumer using the configured JSON backend (see config.jsonlib)."""
+
+    @classmethod
+    async def decode_json(cls, text_data: str) -> Any:
+        return loads(text_data)
+
+    @classmethod
+    async def encode_json(cls, content: Any) -> str:
+        return dumps_str(content)
@@ -5,17 +5,18 @@ import time
 from typing import Any
 
 import logging
-from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.utils import timezone
-from asgiref.sync import sync_to_async
 
 from orders.models import Order
+from ws_realtime.executors import run_data
+
+from .base import JsonWebsocketConsumer
 
 
 logger = logging.getLogger("realtime")
 
 
-class LocationConsumer(AsyncJsonWebsocketConsumer):
+class LocationConsumer(JsonWebsocketConsumer):
     """Rider -> Order group live location updates.
 
     Thin transport consumer:
@@ -79,9 +80,9 @@ class LocationConsumer(AsyncJsonWebsocketConsumer):
         if not user_id:
             return
 
-        is_assigned = await sync_to_async(
+        is_assigned = await run_data(
             lambda: Order.objects.filter(id=order_uuid, rider__user_id=user_id).exists()
-        )()
+        )
         if not is_assigned:
             return
 
@@ -3,15 +3,16 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from channels.generic.websocket import AsyncJsonWebsocketConsumer
-
 from orders.services.order_access_service import get_or_cache_order_access
+from ws_realtime.executors import run_data
+
+from .base import JsonWebsocketConsumer
 
 
 logger = logging.getLogger("realtime")
 
 
-class OrderConsumer(AsyncJsonWebsocketConsumer):
+class OrderConsumer(JsonWebsocketConsumer):
     """Order-scoped realtime subscription consumer.
 
     Thin transport consumer:
@@ -85,10 +86,8 @@ class OrderConsumer(AsyncJsonWebsocketConsumer):
         )
 
     async def _get_access(self, order_id: str) -> dict:
-        # Run cache/db access lookup in a thread to avoid blocking the event loop.
-        from asgiref.sync import sync_to_async
-
-        return await sync_to_async(get_or_cache_order_access)(order_id=order_id)
+        # Run cache/db access lookup in the realtime data pool to avoid blocking the event loop.
+        return await run_data(get_or_cache_order_access, order_id=order_id)
 
     async def disconnect(self, close_code):
         group = getattr(self, "group_name", None)
@@ -0,0 +1,149 @@
+"""Sized thread pools for the blocking work done by WebSocket consumers and middleware.
+
+Plain `sync_to_async` shares one executor with everything else in the process, so a slow
+database can use up every thread and stall all sockets, handshakes included. Realtime
+work runs in two dedicated pools instead:
+
+- `auth`: the user lookup behind every handshake (JwtAuthMiddleware).
+- `data`: order access checks and other per-message lookups in consumers.
+
+A slow DB can then fill the data pool but still cannot block new connections from
+authenticating. Sizes come from WS_AUTH_THREADS and WS_DATA_THREADS. Each pool exports
+its queue depth, busy threads and queue wait time to /api/metrics/ (`ws_pool_*`, see
+config/metrics.py) and logs `ws_pool_slow` when a call waits longer than
+WS_POOL_SLOW_WAIT_MS before it starts.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from config.metrics import record_pool_depth, record_pool_wait
+
+
+logger = logging.getLogger("realtime")
+
+T = TypeVar("T")
+
+AUTH_POOL = "auth"
+DATA_POOL = "data"
+
+# At most one ws_pool_slow line per pool per interval, so a saturated pool cannot flood the logs.
+SLOW_LOG_INTERVAL_SECONDS = 10.0
+
+
+class RealtimePool:
+    def __init__(self, name: str, *, max_workers: int, slow_wait_ms: float):
+        self.name = name
+        self.max_workers = max_workers
+        self.slow_wait_ms = slow_wait_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"ws-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._last_slow_log = 0.0
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        submitted = time.monotonic()
+        started = False
+
+        def _call() -> T:
+            nonlocal started
+            started = True
+            self._on_start((time.monotonic() - submitted) * 1000)
+            # Same connection hygiene as channels' database_sync_to_async.
+            close_old_connections()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                close_old_connections()
+                self._on_finish()
+
+        with self._lock:
+            self._queued += 1
+            self._record_depth()
+        try:
+            return await sync_to_async(_call, thread_sensitive=False, executor=self._executor)()
+        finally:
+            if not started:
+                # Cancelled (e.g. the client went away) before a thread picked it up.
+                with self._lock:
+                    self._queued -= 1
+                    self._record_depth()
+
+    def _record_depth(self) -> None:
+        # Under self._lock, so the exported values move in the same order as the counts.
+        record_pool_depth(self.name, queued=self._queued, active=self._active)
+
+    def _on_start(self, wait_ms: float) -> None:
+        log_slow = False
+        record_pool_wait(self.name, wait_ms / 1000)
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._record_depth()
+            queued, active = self._queued, self._active
+            now = time.monotonic()
+            if wait_ms >= self.slow_wait_ms and now - self._last_slow_log >= SLOW_LOG_INTERVAL_SECONDS:
+                self._last_slow_log = now
+                log_slow = True
+
+        if log_slow:
+            logger.warning(
+                "ws_pool_slow",
+                extra={
+                    "event": "ws_pool_slow",
+                    "pool": self.name,
+                    "wait_ms": round(wait_ms, 1),
+                    "queued": queued,
+                    "active": active,
+                    "max_workers": self.max_workers,
+                },
+            )
+
+    def _on_finish(self) -> None:
+        with self._lock:
+            self._active -= 1
+            self._record_depth()
+
+
+_pools: dict[str, RealtimePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str) -> RealtimePool:
+    # Built on first use, i.e. inside each worker process after gunicorn forks.
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+
+    sizes = {AUTH_POOL: settings.WS_AUTH_THREADS, DATA_POOL: settings.WS_DATA_THREADS}
+    if name not in sizes:
+        raise ValueError(f"Unknown realtime pool {name!r}")
+
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = RealtimePool(
+                name,
+                max_workers=max(1, int(sizes[name])),
+                slow_wait_ms=float(settings.WS_POOL_SLOW_WAIT_MS),
+            )
+            _pools[name] = pool
+    return pool
+
+
+async def run_auth(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await get_pool(AUTH_POOL).run(func, *args, **kwargs)
+
+
+async def run_data(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    return await get_pool(DATA_POOL).run(func, *args, **kwargs)
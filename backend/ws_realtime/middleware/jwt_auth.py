@@ -5,12 +5,13 @@ from typing import Callable, Iterable
 from urllib.parse import parse_qs
 
 import logging
-from asgiref.sync import sync_to_async
 from channels.exceptions import DenyConnection
 from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 
+from ws_realtime.executors import run_auth
+
 
 logger = logging.getLogger("realtime")
 
@@ -81,8 +82,9 @@ async def _authenticate_scope(scope) -> JwtScopeAuthResult:
     jwt_auth = JWTAuthentication()
 
     try:
-        validated = await sync_to_async(jwt_auth.get_validated_token)(token)
-        user = await sync_to_async(jwt_auth.get_user)(validated)
+        # Signature/expiry checks are CPU-only; only the user lookup needs a thread.
+        validated = jwt_auth.get_validated_token(token)
+        user = await run_auth(jwt_auth.get_user, validated)
     except (InvalidToken, TokenError) as e:
         # Spec: reject invalid tokens (but allow missing token to proceed as anonymous).
         logger.info(